@@ -1,13 +1,44 @@
+import sys
 import pygame
+import pygame.gfxdraw
 import numpy as np
 import random
 import math
 import time
+import itertools
+from collections import OrderedDict, deque
 from game_functions import (
     get_random_monster, get_weapon_choice, calculate_win_chance, 
     show_battle_result, create_stats, update_stats, animated_print
 )
 
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional - the jitted helpers run as plain Python without it
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+# pygame-ce's Surface.fblits batches blits without building a list of result rects
+FAST_BLITS = hasattr(pygame.Surface, 'fblits')
+
+# Per-frame debug output (e.g. jump logging); printing stalls the frame when stdout is slow
+DEBUG = False
+
+# Sine/cosine lookup tables for angles quantized to 0.1 degree (3600 bins)
+_TRIG_STEPS = 3600
+_SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, _TRIG_STEPS, endpoint=False)).tolist()
+_COS_LUT = np.cos(np.linspace(0, 2 * np.pi, _TRIG_STEPS, endpoint=False)).tolist()
+
+def sincos(degrees):
+    """(cos, sin) of an angle in degrees, looked up to the nearest 0.1 degree"""
+    index = round(degrees * 10) % _TRIG_STEPS
+    return _COS_LUT[index], _SIN_LUT[index]
+
 class Vector3D:
     def __init__(self, x=0, y=0, z=0):
         self.x = x
@@ -24,7 +55,7 @@ class Vector3D:
         return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
     
     def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
+        return math.hypot(self.x, self.y, self.z)
     
     def normalize(self):
         mag = self.magnitude()
@@ -32,7 +63,404 @@ class Vector3D:
             return Vector3D(self.x / mag, self.y / mag, self.z / mag)
         return Vector3D(0, 0, 0)
 
+# Wall face directions (dx, dz): North, East, South, West
+WALL_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# Corner offsets of each wall face relative to its wall cell, indexed as
+# CORNER_OFS[direction, vertex, axis]; the Y axis is a fraction of wall height
+CORNER_OFS = np.array([
+    [[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]],  # North
+    [[1, 0, 0], [1, 0, 1], [1, 1, 1], [1, 1, 0]],  # East
+    [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]],  # South
+    [[0, 0, 0], [0, 0, 1], [0, 1, 1], [0, 1, 0]],  # West
+], dtype=np.float32)
+
+# Distance resolution of the shading lookup tables (bins per world unit)
+SHADE_BINS_PER_UNIT = 4
+
+def shade_lut(base_colors, falloff, min_factor):
+    """Lookup table [color, distance bin] -> RGB for lighting = max(min_factor, 1 - distance / falloff);
+    index it with shade_bins()"""
+    bins = int(math.ceil(falloff * (1 - min_factor) * SHADE_BINS_PER_UNIT)) + 1
+    factors = np.clip(1.0 - np.arange(bins) / SHADE_BINS_PER_UNIT / falloff, min_factor, 1.0)
+    return (np.asarray(base_colors, dtype=np.float64)[:, None, :] * factors[None, :, None]).astype(np.int64)
+
+# Painter's-sort resolution: 0.01 world unit depth bins, the full uint16 range covers 655 units
+DEPTH_BINS_PER_UNIT = 100
+DEPTH_BINS = 65536
+
+def depth_order(distances):
+    """Indices that order distances furthest first, via a stable (radix) sort of uint16 depth bins;
+    the same order as a stable float argsort of -distances"""
+    distances = np.asarray(distances)
+    bins = np.minimum((distances * DEPTH_BINS_PER_UNIT).astype(np.int64), DEPTH_BINS - 1).astype(np.uint16)
+    order = np.argsort(DEPTH_BINS - 1 - bins, kind='stable')
+    
+    # Polygons sharing a bin are rare; re-sort only those, by bin and then exact distance
+    ranked = bins[order]
+    tied = ranked[1:] == ranked[:-1]
+    if tied.any():
+        shared = np.flatnonzero(np.concatenate(([False], tied)) | np.concatenate((tied, [False])))
+        runs = order[shared]
+        order[shared] = runs[np.lexsort((-distances[runs], DEPTH_BINS - 1 - ranked[shared]))]
+    return order
+
+def shade_bins(lut, distances):
+    """Distance bin of each distance for the given shade_lut table"""
+    return np.minimum((np.asarray(distances) * SHADE_BINS_PER_UNIT).astype(np.int64), lut.shape[1] - 1)
+
+@njit(cache=True)
+def dda_blocked(px, pz, wx, wz, maze):
+    """Walk the maze cells from (px, pz) toward the wall corner (wx, wz) one cell
+    crossing at a time (Amanatides-Woo DDA); True if a wall other than cell
+    (wx, wz) holds one of the old 0.5-unit ray march's sample points"""
+    height, width = maze.shape
+    dx = wx - px
+    dz = wz - pz
+    distance = math.sqrt(dx * dx + dz * dz)
+    if distance == 0:
+        return False
+    
+    # The march sampled t = i * t_sample for i = 1 .. samples - 1; a cell the ray only
+    # grazes between two samples (usually a wall beside the target) doesn't block
+    samples = int(distance / 0.5)
+    t_sample = 0.5 / distance
+    
+    cell_x = int(math.floor(px))
+    cell_z = int(math.floor(pz))
+    step_x = 1 if dx > 0 else -1
+    step_z = 1 if dz > 0 else -1
+    
+    # Ray parameter t runs from 0 at the player to 1 at the wall
+    if dx != 0:
+        t_delta_x = abs(1.0 / dx)
+        t_max_x = ((cell_x + 1 - px) if dx > 0 else (px - cell_x)) * t_delta_x
+    else:
+        t_delta_x = math.inf
+        t_max_x = math.inf
+    if dz != 0:
+        t_delta_z = abs(1.0 / dz)
+        t_max_z = ((cell_z + 1 - pz) if dz > 0 else (pz - cell_z)) * t_delta_z
+    else:
+        t_delta_z = math.inf
+        t_max_z = math.inf
+    
+    t_enter = 0.0
+    while True:
+        t_exit = min(t_max_x, t_max_z)
+        
+        # First sample at or after entering this cell
+        sample = max(1, int(math.ceil(t_enter / t_sample)))
+        if sample >= samples:
+            return False
+        
+        if (sample * t_sample < t_exit and
+            0 <= cell_x < width and 0 <= cell_z < height and
+            maze[cell_z, cell_x] == 0 and (cell_x != wx or cell_z != wz)):
+            return True
+        
+        if t_max_x < t_max_z:
+            cell_x += step_x
+            t_max_x += t_delta_x
+        else:
+            cell_z += step_z
+            t_max_z += t_delta_z
+        t_enter = t_exit
+
+@njit(cache=True)
+def occluded_walls(px, pz, wall_x, wall_z, maze):
+    """dda_blocked for arrays of wall cells, leaving walls within 3 units of the player unculled"""
+    occluded = np.zeros(len(wall_x), dtype=np.bool_)
+    for i in range(len(wall_x)):
+        dx = wall_x[i] - px
+        dz = wall_z[i] - pz
+        if dx * dx + dz * dz >= 9.0:
+            occluded[i] = dda_blocked(px, pz, int(wall_x[i]), int(wall_z[i]), maze)
+    return occluded
+
+# Lattice (row, column) offsets of the two triangles (c0, c1, c2) and (c1, c3, c2) of a terrain quad
+_TERRAIN_TRIANGLES = np.array([
+    [[0, 0], [0, 1], [1, 0]],
+    [[0, 1], [1, 1], [1, 0]],
+], dtype=np.int64)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _project_and_shade(terrain, px, py, pz, cos_y, sin_y, cos_x, sin_x, fov_factor, step,
+                       screen_width, screen_height, wall_height, palette, out_pts, out_color, out_dist):
+    """Project the terrain corner lattice and shade its two triangles per step x step quad.
+    
+    Triangle slots that are not fully on screen get out_dist = -1. The palette rows are the
+    get_maze_color colors: wall, cliff, rock, ground_mid, ground_base.
+    """
+    rows = (terrain.shape[0] - step - 1) // step + 2
+    cols = (terrain.shape[1] - step - 1) // step + 2
+    half_w = screen_width / 2
+    half_h = screen_height / 2
+    
+    # Project every lattice corner once (same math as Camera.project_3d_to_2d)
+    corner_x = np.empty((rows, cols), dtype=np.int32)
+    corner_y = np.empty((rows, cols), dtype=np.int32)
+    corner_z = np.empty((rows, cols), dtype=np.float64)
+    visible = np.zeros((rows, cols), dtype=np.bool_)
+    for i in prange(rows):
+        for j in range(cols):
+            rel_x = j * step - px
+            rel_y = terrain[i * step, j * step] - py
+            rel_z = i * step - pz
+            rotated_x = rel_x * cos_y - rel_z * sin_y
+            rotated_z = rel_x * sin_y + rel_z * cos_y
+            final_y = rel_y * cos_x - rotated_z * sin_x
+            final_z = rel_y * sin_x + rotated_z * cos_x
+            corner_z[i, j] = final_z
+            if final_z <= 0.001 or final_z >= 100:
+                continue
+            screen_x = int((rotated_x / (final_z * fov_factor)) * half_w + half_w)
+            screen_y = int((-final_y / (final_z * fov_factor)) * half_h + half_h)
+            corner_x[i, j] = screen_x
+            corner_y[i, j] = screen_y
+            visible[i, j] = 0 <= screen_x < screen_width and 0 <= screen_y < screen_height
+    
+    # Triangles (c0, c1, c2) and (c1, c3, c2) of each quad
+    for i in prange(rows - 1):
+        for j in range(cols - 1):
+            for k in range(2):
+                t = (i * (cols - 1) + j) * 2 + k
+                on_screen = True
+                distance = 0.0
+                height = 0.0
+                for v in range(3):
+                    ci = i + _TERRAIN_TRIANGLES[k, v, 0]
+                    cj = j + _TERRAIN_TRIANGLES[k, v, 1]
+                    on_screen = on_screen and visible[ci, cj]
+                    distance += corner_z[ci, cj]
+                    height += terrain[ci * step, cj * step]
+                distance /= 3
+                height /= 3
+                if not on_screen or distance > 150:
+                    out_dist[t] = -1.0
+                    continue
+                
+                if height >= wall_height * 0.8:
+                    shade = 0
+                elif height >= wall_height * 0.6:
+                    shade = 1
+                elif height >= wall_height * 0.4:
+                    shade = 2
+                elif height > 0.5:
+                    shade = 3
+                else:
+                    shade = 4
+                lighting_factor = max(0.3, min(1.0, 1.0 - distance / 30))
+                for c in range(3):
+                    out_color[t, c] = int(palette[shade, c] * lighting_factor)
+                
+                for v in range(3):
+                    ci = i + _TERRAIN_TRIANGLES[k, v, 0]
+                    cj = j + _TERRAIN_TRIANGLES[k, v, 1]
+                    out_pts[t, v, 0] = corner_x[ci, cj]
+                    out_pts[t, v, 1] = corner_y[ci, cj]
+                out_dist[t] = distance
+
+# All 24 orderings of the carving steps Right, Down, Left, Up (12-unit spacing for huge corridors);
+# picking one at random replaces shuffling the direction list for every stack frame
+_DIR_PERMS = np.array(list(itertools.permutations([(0, 12), (12, 0), (0, -12), (-12, 0)])), dtype=np.int64)
+
+@njit(cache=True)
+def _carve_maze(maze, start_x, start_y, rng_seed):
+    """Carve 7-wide corridors between 7x7 cells on a 12-unit grid by iterative backtracking"""
+    np.random.seed(rng_seed)
+    height, width = maze.shape
+    
+    # Mark starting area as 7x7 open space
+    for dy in range(-3, 4):
+        for dx in range(-3, 4):
+            if (0 <= start_y + dy < height and 0 <= start_x + dx < width):
+                maze[start_y + dy, start_x + dx] = 1
+    
+    stack = [(start_x, start_y)]
+    
+    while len(stack) > 0:
+        current_x, current_y = stack[-1]  # Peek at top of stack
+        directions = _DIR_PERMS[np.random.randint(24)]
+        
+        found_unvisited = False
+        
+        for i in range(4):
+            dx = directions[i, 0]
+            dy = directions[i, 1]
+            nx, ny = current_x + dx, current_y + dy
+            
+            # Check bounds and if cell is unvisited
+            if (6 <= nx < width - 6 and 6 <= ny < height - 6 and 
+                maze[ny, nx] == 0):
+                
+                # Carve very wide corridor (7 units wide) between current and next cell
+                for corridor_step in range(1, abs(dx) + abs(dy)):
+                    step_x = current_x + (dx // abs(dx) if dx != 0 else 0) * corridor_step
+                    step_y = current_y + (dy // abs(dy) if dy != 0 else 0) * corridor_step
+                    
+                    # Make corridor 7 units wide
+                    if dx != 0:  # Horizontal corridor
+                        for offset in range(-3, 4):
+                            if 0 <= step_y + offset < height:
+                                maze[step_y + offset, step_x] = 1
+                    else:  # Vertical corridor
+                        for offset in range(-3, 4):
+                            if 0 <= step_x + offset < width:
+                                maze[step_y, step_x + offset] = 1
+                
+                # Mark destination as 7x7 open area
+                for dy_offset in range(-3, 4):
+                    for dx_offset in range(-3, 4):
+                        if (0 <= ny + dy_offset < height and 0 <= nx + dx_offset < width):
+                            maze[ny + dy_offset, nx + dx_offset] = 1
+                
+                # Add new cell to stack
+                stack.append((nx, ny))
+                found_unvisited = True
+                break
+        
+        # If no unvisited neighbors, backtrack
+        if not found_unvisited:
+            stack.pop()
+
+@njit(cache=True)
+def _connect_room_to_maze(maze, room_x, room_y, room_w, room_h):
+    """Connect a room to the existing maze network"""
+    height, width = maze.shape
+    connections = 0
+    max_connections = np.random.randint(2, 5)
+    
+    # Try to connect from each side: 0 = top, 1 = bottom, 2 = left, 3 = right
+    sides = np.arange(4)
+    np.random.shuffle(sides)
+    
+    for side in sides:
+        if connections >= max_connections:
+            break
+            
+        if side == 0:
+            for x in range(room_x + 2, room_x + room_w - 2, 2):
+                if (room_y > 2 and x >= 0 and x < width and 
+                    room_y - 2 >= 0 and maze[room_y - 2, x] == 1):  # Found passage
+                    maze[room_y - 1, x] = 3  # Corridor
+                    connections += 1
+                    break
+        elif side == 1:
+            for x in range(room_x + 2, room_x + room_w - 2, 2):
+                if (room_y + room_h < height - 2 and x >= 0 and x < width and
+                    room_y + room_h + 1 < height and maze[room_y + room_h + 1, x] == 1):
+                    maze[room_y + room_h, x] = 3  # Corridor
+                    connections += 1
+                    break
+        elif side == 2:
+            for y in range(room_y + 2, room_y + room_h - 2, 2):
+                if (room_x > 2 and y >= 0 and y < height and
+                    room_x - 2 >= 0 and maze[y, room_x - 2] == 1):
+                    maze[y, room_x - 1] = 3  # Corridor
+                    connections += 1
+                    break
+        else:
+            for y in range(room_y + 2, room_y + room_h - 2, 2):
+                if (room_x + room_w < width - 2 and y >= 0 and y < height and
+                    room_x + room_w + 1 < width and maze[y, room_x + room_w + 1] == 1):
+                    maze[y, room_x + room_w] = 3  # Corridor
+                    connections += 1
+                    break
+
+@njit(cache=True)
+def _wall_integral(maze):
+    """Summed-area table of wall cells, padded with a leading zero row and column"""
+    height, width = maze.shape
+    table = np.zeros((height + 1, width + 1), dtype=np.int32)
+    for y in range(height):
+        row_walls = 0
+        for x in range(width):
+            if maze[y, x] == 0:
+                row_walls += 1
+            table[y + 1, x + 1] = table[y, x + 1] + row_walls
+    return table
+
+@njit(cache=True)
+def _add_rooms(maze, rng_seed):
+    """Carve large rooms into mostly-wall areas; returns an (N, 4) array of x, y, width, height"""
+    np.random.seed(rng_seed)
+    height, width = maze.shape
+    num_rooms = np.random.randint(8, 16)
+    rooms = np.empty((num_rooms, 4), dtype=np.int64)
+    placed = 0
+    walls = _wall_integral(maze)
+    
+    for _ in range(num_rooms):
+        # Random room size (odd dimensions for proper maze integration) - 15x15 to 25x25
+        room_w = 15 + 2 * np.random.randint(0, 6)
+        room_h = 15 + 2 * np.random.randint(0, 6)
+        
+        # Random odd position, at least 5 cells from the edges
+        room_x = 5 + 2 * np.random.randint(0, (width - room_w - 9) // 2)
+        room_y = 5 + 2 * np.random.randint(0, (height - room_h - 9) // 2)
+        
+        # Check if area is mostly walls (good for room placement) - four table reads
+        wall_count = (walls[room_y + room_h, room_x + room_w] - walls[room_y, room_x + room_w] -
+                      walls[room_y + room_h, room_x] + walls[room_y, room_x])
+        total_cells = room_w * room_h
+        
+        # If mostly walls, create room
+        if wall_count > total_cells * 0.8:
+            # Carve out the room
+            maze[room_y + 1:room_y + room_h - 1, room_x + 1:room_x + room_w - 1] = 2  # Mark as room
+            
+            rooms[placed, 0] = room_x
+            rooms[placed, 1] = room_y
+            rooms[placed, 2] = room_w
+            rooms[placed, 3] = room_h
+            placed += 1
+            
+            # Connect room to existing passages
+            _connect_room_to_maze(maze, room_x, room_y, room_w, room_h)
+            
+            # Carving removed walls; refresh the table for the next candidates
+            walls = _wall_integral(maze)
+    
+    return rooms[:placed]
+
+@njit(cache=True)
+def _add_random_connections(maze, rng_seed):
+    """Open random walls that separate two passages to create loops"""
+    np.random.seed(rng_seed)
+    height, width = maze.shape
+    connections_added = 0
+    max_connections = np.random.randint(15, 26)
+    
+    # Draw every candidate cell and roll up front instead of one PRNG call at a time
+    attempts = max_connections * 3  # Try more times than we want
+    xs = np.random.randint(2, width - 2, attempts)
+    ys = np.random.randint(2, height - 2, attempts)
+    rnd = np.random.random((attempts, 2))
+    
+    for i in range(attempts):
+        if connections_added >= max_connections:
+            break
+            
+        x = xs[i]
+        y = ys[i]
+        
+        # If this is a wall and has passages on opposite sides
+        if maze[y, x] == 0:
+            # Check horizontal connection
+            if (maze[y, x - 1] != 0 and maze[y, x + 1] != 0 and
+                rnd[i, 0] < 0.3):
+                maze[y, x] = 3  # Corridor
+                connections_added += 1
+            # Check vertical connection
+            elif (maze[y - 1, x] != 0 and maze[y + 1, x] != 0 and
+                  rnd[i, 1] < 0.3):
+                maze[y, x] = 3  # Corridor
+                connections_added += 1
+
 class MazeMap:
+    _generations = itertools.count(1)  # Source of per-world generation numbers
+    
     def __init__(self, width=81, height=81, base_level=0):  # Moderate sized maze for good performance
         self.width = width if width % 2 == 1 else width + 1  # Ensure odd dimensions
         self.height = height if height % 2 == 1 else height + 1
@@ -40,10 +468,14 @@ class MazeMap:
         self.wall_height = 8  # More reasonable wall height
         self.ceiling_height = 8  # Lower ceiling for better scale
         
-        # Maze data: 0 = wall, 1 = floor, 2 = room, 3 = corridor
+        self.rooms = []  # List of room areas, filled in while the maze is generated
+        
+        # Maze data (uint8 grid indexed [y, x]): 0 = wall, 1 = floor, 2 = room, 3 = corridor
         self.maze = self.generate_maze()
         self.terrain = self.convert_maze_to_terrain()
-        self.rooms = []  # List of room areas
+        # Distinct for every generated world, so renderer caches can tell when the terrain changed
+        self.generation = next(MazeMap._generations)
+        self._index_layout()
         self.monsters = self.place_monsters()
         self.treasures = self.place_treasures()
         
@@ -55,214 +487,62 @@ class MazeMap:
         for y in range(self.height):
             for x in range(self.width):
                 if (x == 0 or x == self.width-1 or y == 0 or y == self.height-1 or 
-                    self.maze[y][x] == 0):  # Maze walls
-                    terrain[y][x] = self.wall_height  # Wall height
+                    self.maze[y, x] == 0):  # Maze walls
+                    terrain[y, x] = self.wall_height  # Wall height
                 else:
-                    terrain[y][x] = self.base_level  # Flat floor
+                    terrain[y, x] = self.base_level  # Flat floor
         
         return terrain
     
     def generate_maze(self):
         """Generate DOOM-style maze using iterative backtracking to avoid recursion limits"""
-        maze = [[0 for _ in range(self.width)] for _ in range(self.height)]
-        
         # Initialize all cells as walls
-        for y in range(self.height):
-            for x in range(self.width):
-                maze[y][x] = 0  # Wall
-        
-        # Iterative backtracking maze generation using a stack
-        stack = []
+        maze = np.zeros((self.height, self.width), dtype=np.uint8)
         
         # Start maze generation from center area (aligned to 12-unit grid for wider spaces)
         start_x = 12 + (self.width // 24) * 12  # Align to 12-unit grid
         start_y = 12 + (self.height // 24) * 12
         
-        # Mark starting area as 7x7 open space
-        for dy in range(-3, 4):
-            for dx in range(-3, 4):
-                if (0 <= start_y + dy < self.height and 0 <= start_x + dx < self.width):
-                    maze[start_y + dy][start_x + dx] = 1
-        
-        stack.append((start_x, start_y))
-        
-        while stack:
-            current_x, current_y = stack[-1]  # Peek at top of stack
-            
-            # Get all possible directions from current cell (much wider spacing for huge corridors)
-            directions = [(0, 12), (12, 0), (0, -12), (-12, 0)]  # Right, Down, Left, Up with 12-unit spacing
-            random.shuffle(directions)
+        # The carving kernels seed np.random from the random module. Compiled, that is Numba's own
+        # generator; as plain Python it is NumPy's global one, so its state is put back afterwards
+        saved_state = None if HAVE_NUMBA else np.random.get_state()
+        try:
+            _carve_maze(maze, start_x, start_y, random.getrandbits(31))
             
-            found_unvisited = False
+            # Add large rooms randomly
+            self.add_rooms(maze)
             
-            for dx, dy in directions:
-                nx, ny = current_x + dx, current_y + dy
-                
-                # Check bounds and if cell is unvisited
-                if (6 <= nx < self.width - 6 and 6 <= ny < self.height - 6 and 
-                    maze[ny][nx] == 0):
-                    
-                    # Carve very wide corridor (7 units wide) between current and next cell
-                    for corridor_step in range(1, abs(dx) + abs(dy)):
-                        step_x = current_x + (dx // abs(dx) if dx != 0 else 0) * corridor_step
-                        step_y = current_y + (dy // abs(dy) if dy != 0 else 0) * corridor_step
-                        
-                        # Make corridor 7 units wide
-                        if dx != 0:  # Horizontal corridor
-                            for offset in range(-3, 4):  # -3, -2, -1, 0, 1, 2, 3
-                                if 0 <= step_y + offset < self.height:
-                                    maze[step_y + offset][step_x] = 1
-                        else:  # Vertical corridor
-                            for offset in range(-3, 4):  # -3, -2, -1, 0, 1, 2, 3
-                                if 0 <= step_x + offset < self.width:
-                                    maze[step_y][step_x + offset] = 1
-                    
-                    # Mark destination as 7x7 open area
-                    for dy_offset in range(-3, 4):
-                        for dx_offset in range(-3, 4):
-                            if (0 <= ny + dy_offset < self.height and 0 <= nx + dx_offset < self.width):
-                                maze[ny + dy_offset][nx + dx_offset] = 1
-                    
-                    # Add new cell to stack
-                    stack.append((nx, ny))
-                    found_unvisited = True
-                    break
-            
-            # If no unvisited neighbors, backtrack
-            if not found_unvisited:
-                stack.pop()
-        
-        # Add large rooms randomly
-        self.add_rooms(maze)
-        
-        # Add some random connections to make it less linear
-        self.add_random_connections(maze)
+            # Add some random connections to make it less linear
+            self.add_random_connections(maze)
+        finally:
+            if saved_state is not None:
+                np.random.set_state(saved_state)
         
         return maze
     
     def add_rooms(self, maze):
         """Add large DOOM-style rooms to the maze"""
-        num_rooms = random.randint(8, 15)
-        
-        for _ in range(num_rooms):
-            # Random room size (odd dimensions for proper maze integration) - much larger
-            room_w = random.randrange(15, 26, 2)  # 15x15 to 25x25, odd only
-            room_h = random.randrange(15, 26, 2)
-            
-            # Random position
-            room_x = random.randrange(5, self.width - room_w - 5, 2)  # Ensure odd position
-            room_y = random.randrange(5, self.height - room_h - 5, 2)
-            
-            # Check if area is mostly walls (good for room placement)
-            wall_count = 0
-            total_cells = room_w * room_h
-            
-            for ry in range(room_y, room_y + room_h):
-                for rx in range(room_x, room_x + room_w):
-                    if maze[ry][rx] == 0:
-                        wall_count += 1
-            
-            # If mostly walls, create room
-            if wall_count > total_cells * 0.8:
-                # Carve out the room
-                for ry in range(room_y + 1, room_y + room_h - 1):
-                    for rx in range(room_x + 1, room_x + room_w - 1):
-                        maze[ry][rx] = 2  # Mark as room
-                
-                # Store room info
-                self.rooms.append({
-                    'x': room_x, 'y': room_y,
-                    'width': room_w, 'height': room_h,
-                    'center_x': room_x + room_w // 2,
-                    'center_y': room_y + room_h // 2
-                })
-                
-                # Connect room to existing passages
-                self.connect_room_to_maze(maze, room_x, room_y, room_w, room_h)
-    
-    def connect_room_to_maze(self, maze, room_x, room_y, room_w, room_h):
-        """Connect a room to the existing maze network"""
-        connections = 0
-        max_connections = random.randint(2, 4)
-        
-        # Try to connect from each side
-        sides = ['top', 'bottom', 'left', 'right']
-        random.shuffle(sides)
-        
-        for side in sides:
-            if connections >= max_connections:
-                break
-                
-            if side == 'top':
-                for x in range(room_x + 2, room_x + room_w - 2, 2):
-                    if (room_y > 2 and x >= 0 and x < self.width and 
-                        room_y - 2 >= 0 and maze[room_y - 2][x] == 1):  # Found passage
-                        maze[room_y - 1][x] = 3  # Corridor
-                        connections += 1
-                        break
-            elif side == 'bottom':
-                for x in range(room_x + 2, room_x + room_w - 2, 2):
-                    if (room_y + room_h < self.height - 2 and x >= 0 and x < self.width and
-                        room_y + room_h + 1 < self.height and maze[room_y + room_h + 1][x] == 1):
-                        maze[room_y + room_h][x] = 3  # Corridor
-                        connections += 1
-                        break
-            elif side == 'left':
-                for y in range(room_y + 2, room_y + room_h - 2, 2):
-                    if (room_x > 2 and y >= 0 and y < self.height and
-                        room_x - 2 >= 0 and maze[y][room_x - 2] == 1):
-                        maze[y][room_x - 1] = 3  # Corridor
-                        connections += 1
-                        break
-            elif side == 'right':
-                for y in range(room_y + 2, room_y + room_h - 2, 2):
-                    if (room_x + room_w < self.width - 2 and y >= 0 and y < self.height and
-                        room_x + room_w + 1 < self.width and maze[y][room_x + room_w + 1] == 1):
-                        maze[y][room_x + room_w] = 3  # Corridor
-                        connections += 1
-                        break
+        for room_x, room_y, room_w, room_h in _add_rooms(maze, random.getrandbits(31)).tolist():
+            # Store room info
+            self.rooms.append({
+                'x': room_x, 'y': room_y,
+                'width': room_w, 'height': room_h,
+                'center_x': room_x + room_w // 2,
+                'center_y': room_y + room_h // 2
+            })
     
     def add_random_connections(self, maze):
         """Add random connections to create loops and make exploration interesting"""
-        connections_added = 0
-        max_connections = random.randint(15, 25)
-        
-        for _ in range(max_connections * 3):  # Try more times than we want
-            if connections_added >= max_connections:
-                break
-                
-            x = random.randrange(2, self.width - 2)
-            y = random.randrange(2, self.height - 2)
-            
-            # If this is a wall and has passages on opposite sides
-            if maze[y][x] == 0:
-                # Check horizontal connection
-                if (maze[y][x-1] in [1, 2, 3] and maze[y][x+1] in [1, 2, 3] and
-                    random.random() < 0.3):
-                    maze[y][x] = 3  # Corridor
-                    connections_added += 1
-                # Check vertical connection
-                elif (maze[y-1][x] in [1, 2, 3] and maze[y+1][x] in [1, 2, 3] and
-                      random.random() < 0.3):
-                    maze[y][x] = 3  # Corridor
-                    connections_added += 1
+        _add_random_connections(maze, random.getrandbits(31))
     
     def convert_maze_to_terrain(self):
         """Convert maze data to height-based terrain for 3D rendering"""
-        terrain = []
+        # Floors (rooms and corridors alike) stay at base level
+        terrain = np.full(self.maze.shape, self.base_level, dtype=np.float32)
         
-        for y in range(self.height):
-            row = []
-            for x in range(self.width):
-                if self.maze[y][x] == 0:  # Wall
-                    # Make walls much taller and more prominent
-                    height_variation = random.uniform(2.0, 4.0)
-                    row.append(self.wall_height + height_variation)
-                elif self.maze[y][x] == 2:  # Room floor
-                    row.append(self.base_level)  # Keep rooms at base level
-                else:  # Corridor floor (1 or 3)
-                    row.append(self.base_level)
-            terrain.append(row)
+        # Make walls much taller and more prominent, with per-wall height variation
+        wall_mask = self.maze == 0
+        terrain[wall_mask] = self.wall_height + np.random.uniform(2.0, 4.0, size=np.count_nonzero(wall_mask))
         
         return terrain
     
@@ -271,144 +551,154 @@ class MazeMap:
         # Calculate direction from player to wall
         dx = wall_x - player_pos.x
         dz = wall_z - player_pos.z
-        distance_to_wall = (dx*dx + dz*dz)**0.5
         
-        # Don't cull walls that are very close
-        if distance_to_wall < 3.0:
+        # Don't cull walls that are very close (within 3 units)
+        if dx * dx + dz * dz < 9.0:
             return False
             
-        # Normalize direction vector
-        if distance_to_wall == 0:
-            return False
-        dx /= distance_to_wall
-        dz /= distance_to_wall
-        
         # Cast ray from player toward wall, checking for blocking walls
-        step_size = 0.5  # Check every 0.5 units
-        steps = int(distance_to_wall / step_size)
-        
-        for i in range(1, steps):  # Start from 1 to skip player position
-            check_x = player_pos.x + dx * (i * step_size)
-            check_z = player_pos.z + dz * (i * step_size)
-            
-            # Convert to maze coordinates
-            maze_x = int(check_x)
-            maze_z = int(check_z)
-            
-            # Check if we hit a wall that's closer than our target wall
-            if (0 <= maze_x < self.width and 0 <= maze_z < self.height and
-                self.maze[maze_z][maze_x] == 0):  # Found a blocking wall
-                # Make sure this isn't the wall we're checking
-                if abs(maze_x - wall_x) > 0.5 or abs(maze_z - wall_z) > 0.5:
-                    return True  # This wall is occluded
-                    
-        return False  # Wall is not occluded
+        return dda_blocked(float(player_pos.x), float(player_pos.z), int(wall_x), int(wall_z), self.maze)
     
-    def generate_wall_faces(self, maze_map, player):
-        """Generate vertical wall faces for proper 3D wall rendering"""
-        wall_triangles = []
-        
-        # Check area around player for walls
-        player_x, player_z = int(player.position.x), int(player.position.z)
-        render_range = 15  # Reduced range for better performance and less z-fighting
-        
-        for z in range(max(0, player_z - render_range), min(maze_map.height, player_z + render_range)):
-            for x in range(max(0, player_x - render_range), min(maze_map.width, player_x + render_range)):
-                if maze_map.maze[z][x] == 0:  # This is a wall
-                    # Check adjacent cells to create wall faces
-                    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # North, East, South, West
-                    
-                    for dx, dz in directions:
-                        adj_x, adj_z = x + dx, z + dz
-                        
-                        # Create wall face if adjacent cell is a corridor or out of bounds
-                        if (adj_x < 0 or adj_x >= maze_map.width or 
-                            adj_z < 0 or adj_z >= maze_map.height or 
-                            maze_map.maze[adj_z][adj_x] != 0):  # Adjacent is not a wall
-                            
-                            wall_height = maze_map.wall_height
-                            floor_level = maze_map.base_level
-                            
-                            # Create wall face vertices
-                            if dx == 0:  # North/South face
-                                face_x = x + 0.5
-                                face_z = z + 0.5 + dz * 0.5
-                                
-                                v1 = Vector3D(face_x - 0.5, floor_level, face_z)
-                                v2 = Vector3D(face_x + 0.5, floor_level, face_z)
-                                v3 = Vector3D(face_x + 0.5, floor_level + wall_height, face_z)
-                                v4 = Vector3D(face_x - 0.5, floor_level + wall_height, face_z)
-                            else:  # East/West face
-                                face_x = x + 0.5 + dx * 0.5
-                                face_z = z + 0.5
-                                
-                                v1 = Vector3D(face_x, floor_level, face_z - 0.5)
-                                v2 = Vector3D(face_x, floor_level, face_z + 0.5)
-                                v3 = Vector3D(face_x, floor_level + wall_height, face_z + 0.5)
-                                v4 = Vector3D(face_x, floor_level + wall_height, face_z - 0.5)
-                            
-                            # Project vertices to screen
-                            screen_vertices = []
-                            total_distance = 0
-                            
-                            for vertex in [v1, v2, v3, v4]:
-                                screen_pos = self.camera.project_3d_to_2d(
-                                    vertex, player.position, player.rotation_x, player.rotation_y,
-                                    self.width, self.height
-                                )
-                                if screen_pos and screen_pos[2] > 0.001 and screen_pos[2] < 100 and 0 <= screen_pos[0] < self.width and 0 <= screen_pos[1] < self.height:
-                                    screen_vertices.append(screen_pos)
-                                    total_distance += screen_pos[2]
-                                else:
-                                    break
-                            
-                            # Create triangles from quad (2 triangles per wall face)
-                            if len(screen_vertices) == 4:
-                                avg_distance = total_distance / 4
-                                wall_color = (120, 100, 80)  # Brown wall color
-                                
-                                # Triangle 1: v1, v2, v3
-                                tri1 = ([screen_vertices[0], screen_vertices[1], screen_vertices[2]], wall_height, avg_distance)
-                                # Triangle 2: v1, v3, v4  
-                                tri2 = ([screen_vertices[0], screen_vertices[2], screen_vertices[3]], wall_height, avg_distance)
-                                
-                                wall_triangles.append(tri1)
-                                wall_triangles.append(tri2)
-        
-        return wall_triangles
+    def walls_occluded(self, wall_x, wall_z, player_pos):
+        """Vectorized is_wall_occluded: a boolean mask for arrays of wall cells"""
+        return occluded_walls(float(player_pos.x), float(player_pos.z), wall_x, wall_z, self.maze)
+    
+    def visible_wall_quads(self, player_pos, render_range):
+        """Wall faces around the player that face into the maze, are in range and aren't occluded.
+        
+        Occlusion only depends on where the player stands, so the result is cached until they move.
+        """
+        key = (player_pos.x, player_pos.z, render_range)
+        if key == self._visible_walls_key:
+            return self._visible_walls
+        
+        # Start from the precomputed faces around the player that look into the maze
+        quads = self.wall_quads_near(int(player_pos.x), int(player_pos.z), render_range)
+        quads = quads[self.wall_faces_inside[quads]]
+        
+        # Distance culling for walls - don't render walls too far away (extended range to prevent pop-in)
+        max_wall_distance_sq = (render_range + 5) * (render_range + 5)
+        dx_wall = self.wall_cx[quads] - player_pos.x
+        dz_wall = self.wall_cz[quads] - player_pos.z
+        quads = quads[dx_wall * dx_wall + dz_wall * dz_wall <= max_wall_distance_sq]
+        
+        # Occlusion culling - skip walls that are behind other walls (one ray per wall cell;
+        # the faces of a cell are adjacent because the quads are sorted by cell)
+        keys = self.wall_keys[quads]
+        first_face = np.ones(len(keys), dtype=bool)
+        first_face[1:] = keys[1:] != keys[:-1]
+        cells = quads[first_face]
+        occluded = self.walls_occluded(self.wall_cx[cells], self.wall_cz[cells], player_pos)
+        quads = quads[~occluded[np.cumsum(first_face) - 1]]
+        
+        self._visible_walls_key = key
+        self._visible_walls = quads
+        return quads
+    
+    def _index_layout(self):
+        """Build the wall faces, caches and floor list derived from the maze layout"""
+        self._build_static_wall_quads()
+        # Wall quad windows by player cell, least recently used first
+        self._wall_cache = OrderedDict()
+        # Unoccluded wall faces for the last player position; turning in place reuses them
+        self._visible_walls_key = None
+        self._visible_walls = None
+        # (z, x) of every interior floor cell, shared by monster and treasure placement
+        self._floor_coords = np.argwhere(self.maze[1:-1, 1:-1] != 0) + 1
+    
+    def carve_room(self, x0, z0, x1, z1):
+        """Open cells [x0, x1) x [z0, z1) as room floor; the only change to a maze after generation"""
+        self.maze[max(0, z0):z1, max(0, x0):x1] = 2
+        self._index_layout()
+    
+    def _build_static_wall_quads(self):
+        """Precompute every exposed wall face; rebuilt only if the layout is carved after generation"""
+        open_cells = self.maze != 0
+        # Out of bounds counts as open so border walls get their outer faces
+        padded = np.pad(open_cells, 1, constant_values=True)
+        
+        exposed = np.empty((self.height, self.width, len(WALL_DIRECTIONS)), dtype=bool)
+        for direction, (dx, dz) in enumerate(WALL_DIRECTIONS):
+            neighbor_open = padded[1 + dz:1 + dz + self.height, 1 + dx:1 + dx + self.width]
+            exposed[:, :, direction] = ~open_cells & neighbor_open
+        
+        # Row-major nonzero keeps the quads sorted by cz * width + cx
+        wall_cz, wall_cx, wall_dir = np.nonzero(exposed)
+        self.wall_cx = wall_cx.astype(np.int16)
+        self.wall_cz = wall_cz.astype(np.int16)
+        self.wall_dir = wall_dir.astype(np.int8)
+        self.wall_keys = wall_cz * self.width + wall_cx
+        # Border walls also get faces looking out of the map; the in-game wall pass skips those
+        steps = np.array(WALL_DIRECTIONS)[wall_dir]
+        neighbor_x, neighbor_z = wall_cx + steps[:, 0], wall_cz + steps[:, 1]
+        self.wall_faces_inside = ((neighbor_x >= 0) & (neighbor_x < self.width) &
+                                  (neighbor_z >= 0) & (neighbor_z < self.height))
+        # Bounding spheres of the faces for frustum culling before projection; the radius is padded
+        # by a quarter unit, several pixels at wall range, so faces whose outlines poke in survive
+        face_centers = CORNER_OFS.mean(axis=1) * (1.0, self.wall_height, 1.0)
+        self.wall_centers = (np.stack((wall_cx, np.full(len(wall_cx), self.base_level), wall_cz), axis=1)
+                             + face_centers[wall_dir])
+        self.wall_radius = math.hypot(0.5, self.wall_height / 2) + 0.25
+    
+    def select_wall_quads(self, x0, z0, x1, z1):
+        """Indices of the static wall quads whose cell lies in [x0, x1) x [z0, z1)"""
+        row_keys = np.arange(z0, z1) * self.width
+        starts = np.searchsorted(self.wall_keys, row_keys + x0)
+        ends = np.searchsorted(self.wall_keys, row_keys + x1)
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts.tolist(), ends.tolist())])
+    
+    def wall_quads_near(self, player_x, player_z, render_range):
+        """Cached select_wall_quads for the square window around a player cell"""
+        key = (player_x, player_z, render_range)
+        quads = self._wall_cache.get(key)
+        if quads is not None:
+            self._wall_cache.move_to_end(key)
+            return quads
+        
+        quads = self.select_wall_quads(max(0, player_x - render_range), max(0, player_z - render_range),
+                                       min(self.width, player_x + render_range), min(self.height, player_z + render_range))
+        self._wall_cache[key] = quads
+        if len(self._wall_cache) > 64:
+            self._wall_cache.popitem(last=False)
+        return quads
+    
+    def wall_quad_vertices(self, quads):
+        """World-space corners of the given wall quads as an (M, 4, 3) array"""
+        origins = np.stack((self.wall_cx[quads], np.zeros(len(quads), dtype=np.int16), self.wall_cz[quads]), axis=1)
+        scale = np.array([1.0, self.wall_height, 1.0], dtype=np.float32)
+        vertices = origins[:, None, :] + CORNER_OFS[self.wall_dir[quads]] * scale
+        vertices[:, :, 1] += self.base_level
+        return vertices
     
     def place_monsters(self):
         """Place monsters in maze corridors and rooms"""
         monsters = {}
         num_monsters = random.randint(20, 35)  # More monsters for bigger maze
         
-        # Collect all valid positions (corridors and rooms)
-        valid_positions = []
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if self.maze[y][x] in [1, 2, 3]:  # Floor spaces
-                    valid_positions.append((x, y))
+        # All valid positions (corridors and rooms), shuffled for random placement
+        valid_positions = self._floor_coords.copy()
+        np.random.shuffle(valid_positions)
         
-        # Shuffle for random placement
-        random.shuffle(valid_positions)
+        # Monster positions are also kept as a parallel array and a (z, x) -> index grid
+        monster_xz = np.empty((num_monsters, 2), dtype=np.int16)
+        self.monster_grid = np.full((self.height, self.width), -1, dtype=np.int32)
         
         placed = 0
-        for x, z in valid_positions:
+        for z, x in valid_positions.tolist():
             if placed >= num_monsters:
                 break
                 
-            # Skip positions too close to each other
-            too_close = False
-            for (mx, mz) in monsters.keys():
-                if abs(x - mx) + abs(z - mz) < 3:  # Manhattan distance
-                    too_close = True
-                    break
+            # Skip positions too close to each other (Manhattan distance to every placed monster)
+            placed_xz = monster_xz[:placed]
+            too_close = (np.abs(placed_xz[:, 0] - x) + np.abs(placed_xz[:, 1] - z) < 3).any()
             
             if not too_close:
                 monster_name, monster_info = get_random_monster()
                 
                 # Stronger monsters in rooms, weaker in corridors
-                if self.maze[z][x] == 2:  # Room
+                if self.maze[z, x] == 2:  # Room
                     health_bonus = random.randint(1, 2)
                 else:
                     health_bonus = 0
@@ -419,8 +709,13 @@ class MazeMap:
                     'defeated': False,
                     'health': random.randint(2, 4) + health_bonus
                 }
+                monster_xz[placed] = (x, z)
+                self.monster_grid[z, x] = placed
                 placed += 1
         
+        # (x, z) of every monster in placement order, with the undefeated ones flagged for the minimap
+        self.monster_xz = monster_xz[:placed]
+        self.monster_alive = np.ones(placed, dtype=bool)
         return monsters
     
     def place_treasures(self):
@@ -434,45 +729,38 @@ class MazeMap:
         # Add room centers
         for room in self.rooms:
             cx, cy = room['center_x'], room['center_y']
-            if (cx, cy) not in self.monsters:
+            if self.monster_grid[cy, cx] < 0:
                 treasure_positions.append((cx, cy, 'room_center'))
         
         # Find dead ends in corridors
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if self.maze[y][x] in [1, 3]:  # Corridor
-                    # Count adjacent floor spaces
-                    adjacent_floors = 0
-                    for dy in [-1, 0, 1]:
-                        for dx in [-1, 0, 1]:
-                            if dy == 0 and dx == 0:
-                                continue
-                            nx, ny = x + dx, y + dy
-                            if (0 <= nx < self.width and 0 <= ny < self.height and 
-                                self.maze[ny][nx] in [1, 2, 3]):
-                                adjacent_floors += 1
-                    
-                    # Dead end or corner
-                    if adjacent_floors <= 2:
-                        treasure_positions.append((x, y, 'dead_end'))
-        
-        # Add some random positions
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if (self.maze[y][x] in [1, 2, 3] and 
-                    (x, y) not in self.monsters and 
-                    random.random() < 0.1):
-                    treasure_positions.append((x, y, 'random'))
+        floor = np.isin(self.maze, (1, 2, 3)).astype(np.int8)
+        # Count adjacent floor spaces for every interior cell at once (3x3 window minus the cell itself)
+        windows = np.lib.stride_tricks.sliding_window_view(floor, (3, 3))
+        adjacent_floors = windows.sum(axis=(2, 3)) - floor[1:-1, 1:-1]
+        corridors = np.isin(self.maze[1:-1, 1:-1], (1, 3))
+        
+        # Dead end or corner
+        for y, x in (np.argwhere(corridors & (adjacent_floors <= 2)) + 1).tolist():
+            treasure_positions.append((x, y, 'dead_end'))
+        
+        # Add some random positions (about 10% of the free floor cells)
+        free_floor = self._floor_coords[self.monster_grid[self._floor_coords[:, 0], self._floor_coords[:, 1]] < 0]
+        for y, x in free_floor[np.random.random(len(free_floor)) < 0.1].tolist():
+            treasure_positions.append((x, y, 'random'))
         
         # Shuffle and place treasures
         random.shuffle(treasure_positions)
         
+        # Treasure positions are also kept as a parallel array and a (z, x) -> index grid
+        treasure_xz = np.empty((num_treasures, 2), dtype=np.int16)
+        self.treasure_grid = np.full((self.height, self.width), -1, dtype=np.int32)
+        
         placed = 0
         for x, z, location_type in treasure_positions:
             if placed >= num_treasures:
                 break
                 
-            if (x, z) not in self.monsters and (x, z) not in treasures:
+            if self.monster_grid[z, x] < 0 and self.treasure_grid[z, x] < 0:
                 # Better treasures in rooms and dead ends
                 if location_type == 'room_center':
                     treasure_type = random.choice(['mega_health', 'weapon_upgrade', 'points', 'mega_health'])
@@ -485,10 +773,34 @@ class MazeMap:
                     'opened': False,
                     'contents': treasure_type
                 }
+                treasure_xz[placed] = (x, z)
+                self.treasure_grid[z, x] = placed
                 placed += 1
         
+        # (x, z) of every treasure in placement order, with the unopened ones flagged for the minimap
+        self.treasure_xz = treasure_xz[:placed]
+        self.treasure_closed = np.ones(placed, dtype=bool)
         return treasures
     
+    def defeat_monster(self, cell):
+        """Mark the monster at cell (x, z) defeated"""
+        self.monsters[cell]['defeated'] = True
+        self.monster_alive[self.monster_grid[cell[1], cell[0]]] = False
+    
+    def open_treasure(self, cell):
+        """Mark the treasure at cell (x, z) opened"""
+        self.treasures[cell]['opened'] = True
+        self.treasure_closed[self.treasure_grid[cell[1], cell[0]]] = False
+    
+    def nearest_walkable(self, x, z):
+        """Walkable cell (corridor, room or door) closest to (x, z) in Chebyshev distance, or None"""
+        walkable = np.argwhere((self.maze >= 1) & (self.maze <= 3))
+        if len(walkable) == 0:
+            return None
+        distances = np.maximum(np.abs(walkable[:, 0] - z), np.abs(walkable[:, 1] - x))
+        best_z, best_x = walkable[distances.argmin()].tolist()
+        return best_x, best_z
+    
     def get_floor_height(self, x, z):
         """Get floor height - returns floor 1 unit below base level"""
         # Floor is 1 unit below where walls start from
@@ -524,12 +836,29 @@ class Player:
         self.level = 1
         self.minimum_safe_height = None  # Will be set by game initialization
         
+    @property
+    def rotation_y(self):
+        """Horizontal rotation in degrees; setting it refreshes the movement basis"""
+        return self._rotation_y
+    
+    @rotation_y.setter
+    def rotation_y(self, value):
+        self._rotation_y = value
+        self._update_basis()
+    
+    def _update_basis(self):
+        """Ground-plane forward and right unit vectors matching the camera transform (which uses -rotation_y)"""
+        cos_y, sin_y = sincos(-self._rotation_y)
+        self._forward = (sin_y, cos_y)
+        self._right = (cos_y, -sin_y)
+    
     def jump(self):
         """Make player jump if on ground"""
         if not self.is_jumping and abs(self.velocity_y) < 0.1:  # Only jump if on ground
             self.velocity_y = self.jump_strength
             self.is_jumping = True
-            print(f"🦘 Player jumped! Velocity: {self.velocity_y}")  # Debug jump
+            if DEBUG:
+                print(f"🦘 Player jumped! Velocity: {self.velocity_y}")  # Debug jump
     
     def apply_physics(self, maze_map, dt=1.0/60.0):
         """Apply physics: gravity, ground collision, etc."""
@@ -572,7 +901,7 @@ class Player:
         maze_z = int(new_z)
         
         # Only allow movement in walkable areas (corridors, rooms, doors)
-        if maze_map.maze[maze_z][maze_x] in [1, 2, 3]:  # Walkable areas
+        if maze_map.maze[maze_z, maze_x] != 0:  # Walkable areas
             return True
         
         return False  # Block movement into walls (0) or other non-walkable areas
@@ -586,19 +915,16 @@ class Player:
         # Player is on ground if they're at or very close to ground level
         return abs(self.position.y - ground_level) < 0.1
     
-    def move_forward(self, maze_map):
+    def move_forward(self, maze_map, speed=None):
         """Move forward in the direction the camera is looking (W key)"""
         # Match camera projection: uses -rotation_y, so forward is in -Z direction when rotation_y=0
-        # Forward vector calculation matching camera transform
-        cos_y = math.cos(math.radians(-self.rotation_y))
-        sin_y = math.sin(math.radians(-self.rotation_y))
+        # Forward direction in camera space is (0, 0, 1), transformed to world space
+        forward_x, forward_z = self._forward
         
-        # Forward direction in camera space is (0, 0, 1), transform to world space
-        forward_x = sin_y
-        forward_z = cos_y
-        
-        new_x = self.position.x + forward_x * self.speed
-        new_z = self.position.z + forward_z * self.speed
+        if speed is None:
+            speed = self.speed
+        new_x = self.position.x + forward_x * speed
+        new_z = self.position.z + forward_z * speed
         
         # Try wall sliding if direct movement fails
         if not self.can_move_to(new_x, new_z, maze_map):
@@ -615,18 +941,16 @@ class Player:
             self.position.z = new_z
             self.update_position(maze_map)
     
-    def move_backward(self, maze_map):
+    def move_backward(self, maze_map, speed=None):
         """Move backward opposite to camera direction (S key)"""
         # Backward is opposite to forward direction
-        cos_y = math.cos(math.radians(-self.rotation_y))
-        sin_y = math.sin(math.radians(-self.rotation_y))
-        
-        # Backward direction (opposite of forward)
-        backward_x = -sin_y
-        backward_z = -cos_y
+        backward_x = -self._forward[0]
+        backward_z = -self._forward[1]
         
-        new_x = self.position.x + backward_x * self.speed
-        new_z = self.position.z + backward_z * self.speed
+        if speed is None:
+            speed = self.speed
+        new_x = self.position.x + backward_x * speed
+        new_z = self.position.z + backward_z * speed
         
         # Try wall sliding if direct movement fails
         if not self.can_move_to(new_x, new_z, maze_map):
@@ -643,18 +967,16 @@ class Player:
             self.position.z = new_z
             self.update_position(maze_map)
     
-    def strafe_left(self, maze_map):
+    def strafe_left(self, maze_map, speed=None):
         """Move left perpendicular to camera direction (A key)"""
         # Left is perpendicular to forward direction (90 degrees counter-clockwise)
-        cos_y = math.cos(math.radians(-self.rotation_y))
-        sin_y = math.sin(math.radians(-self.rotation_y))
-        
-        # Left direction: rotate forward vector 90 degrees counter-clockwise
-        left_x = -cos_y
-        left_z = sin_y
+        left_x = -self._right[0]
+        left_z = -self._right[1]
         
-        new_x = self.position.x + left_x * self.speed
-        new_z = self.position.z + left_z * self.speed
+        if speed is None:
+            speed = self.speed
+        new_x = self.position.x + left_x * speed
+        new_z = self.position.z + left_z * speed
         
         # Try wall sliding if direct movement fails
         if not self.can_move_to(new_x, new_z, maze_map):
@@ -671,18 +993,15 @@ class Player:
             self.position.z = new_z
             self.update_position(maze_map)
     
-    def strafe_right(self, maze_map):
+    def strafe_right(self, maze_map, speed=None):
         """Move right perpendicular to camera direction (D key)"""
         # Right is perpendicular to forward direction (90 degrees clockwise)
-        cos_y = math.cos(math.radians(-self.rotation_y))
-        sin_y = math.sin(math.radians(-self.rotation_y))
+        right_x, right_z = self._right
         
-        # Right direction: rotate forward vector 90 degrees clockwise
-        right_x = cos_y
-        right_z = -sin_y
-        
-        new_x = self.position.x + right_x * self.speed
-        new_z = self.position.z + right_z * self.speed
+        if speed is None:
+            speed = self.speed
+        new_x = self.position.x + right_x * speed
+        new_z = self.position.z + right_z * speed
         
         # Try wall sliding if direct movement fails
         if not self.can_move_to(new_x, new_z, maze_map):
@@ -716,25 +1035,50 @@ class Camera:
         self.fov = fov
         self.near = near
         self.far = far
+        
+        # Rotation trig is cached per (rot_x, rot_y) - every vertex of a frame shares it
+        self._cached_rotation = None
+        self._rotation_trig = (1.0, 0.0, 1.0, 0.0)
+        self._fov_factor = math.tan(math.radians(fov / 2))
+    
+    def projection_constants(self, player_rot_x, player_rot_y):
+        """(cos_y, sin_y, cos_x, sin_x, fov_factor) used by project_3d_to_2d, for jitted projection kernels"""
+        return self._trig(player_rot_x, player_rot_y) + (self._fov_factor,)
+    
+    def begin_frame(self, player_rot_x, player_rot_y):
+        """Compute the per-frame projection constants once, before any vertex is projected"""
+        self._fov_factor = math.tan(math.radians(self.fov / 2))
+        self._trig(player_rot_x, player_rot_y)
+    
+    def _trig(self, player_rot_x, player_rot_y):
+        """(cos_y, sin_y, cos_x, sin_x) for the camera rotation, recomputed only when it changes"""
+        rotation = (player_rot_x, player_rot_y)
+        if rotation != self._cached_rotation:
+            self._cached_rotation = rotation
+            cos_y, sin_y = sincos(-player_rot_y)
+            cos_x, sin_x = sincos(player_rot_x)  # Removed negative sign to fix inversion
+            self._rotation_trig = (cos_y, sin_y, cos_x, sin_x)
+        return self._rotation_trig
     
     def project_3d_to_2d(self, point, player_pos, player_rot_x, player_rot_y, screen_width, screen_height):
         """Enhanced 3D to 2D projection with proper camera transform"""
+        return self.project_3d_to_2d_xyz(point.x, point.y, point.z, player_pos, player_rot_x, player_rot_y,
+                                         screen_width, screen_height)
+    
+    def project_3d_to_2d_xyz(self, x, y, z, player_pos, player_rot_x, player_rot_y, screen_width, screen_height):
+        """project_3d_to_2d for a point given as raw coordinates, so hot loops don't allocate a Vector3D"""
         # Translate relative to player (camera position)
-        rel_x = point.x - player_pos.x
-        rel_y = point.y - player_pos.y  
-        rel_z = point.z - player_pos.z
+        rel_x = x - player_pos.x
+        rel_y = y - player_pos.y  
+        rel_z = z - player_pos.z
         
-        # Apply horizontal rotation (Y-axis rotation for looking left/right)
-        cos_y = math.cos(math.radians(-player_rot_y))
-        sin_y = math.sin(math.radians(-player_rot_y))
+        cos_y, sin_y, cos_x, sin_x = self._trig(player_rot_x, player_rot_y)
         
+        # Apply horizontal rotation (Y-axis rotation for looking left/right)
         rotated_x = rel_x * cos_y - rel_z * sin_y
         rotated_z = rel_x * sin_y + rel_z * cos_y
         
         # Apply vertical rotation (X-axis rotation for looking up/down) - FIXED INVERSION
-        cos_x = math.cos(math.radians(player_rot_x))  # Removed negative sign to fix inversion
-        sin_x = math.sin(math.radians(player_rot_x))  # Removed negative sign to fix inversion
-        
         final_y = rel_y * cos_x - rotated_z * sin_x
         final_z = rel_y * sin_x + rotated_z * cos_x
         
@@ -743,13 +1087,62 @@ class Camera:
             return None
         
         # Perspective projection
-        fov_factor = math.tan(math.radians(self.fov / 2))
+        fov_factor = self._fov_factor
         
         # Project to screen coordinates
         screen_x = (rotated_x / (final_z * fov_factor)) * (screen_width / 2) + (screen_width / 2)
         screen_y = (-final_y / (final_z * fov_factor)) * (screen_height / 2) + (screen_height / 2)  # Flip Y-axis
         
         return (int(screen_x), int(screen_y), final_z)
+    
+    def build_matrix(self, player_pos, player_rot_x, player_rot_y):
+        """Camera transform as (R, t) so that camera-space points are world @ R.T + t"""
+        # Same rotations as project_3d_to_2d (Y then X) folded into one matrix
+        cos_y, sin_y, cos_x, sin_x = self._trig(player_rot_x, player_rot_y)
+        rotation = np.array([
+            [cos_y, 0.0, -sin_y],
+            [-sin_x * sin_y, cos_x, -sin_x * cos_y],
+            [cos_x * sin_y, sin_x, cos_x * cos_y],
+        ])
+        translation = -rotation @ np.array([player_pos.x, player_pos.y, player_pos.z])
+        return rotation, translation
+    
+    def frustum_mask(self, centers, radius, player_pos, player_rot_x, player_rot_y):
+        """True for spheres (an (..., 3) array of world-space centers, shared radius) that may
+        intersect the view frustum; tested in camera space against the near and four side planes"""
+        rotation, translation = self.build_matrix(player_pos, player_rot_x, player_rot_y)
+        camera_points = centers @ rotation.T + translation
+        side_x, side_y, depth = camera_points[..., 0], camera_points[..., 1], camera_points[..., 2]
+        
+        # Side planes x = +-z * fov_factor and y = +-z * fov_factor, as unit-normal distances
+        fov_factor = self._fov_factor
+        reach = radius * math.sqrt(1 + fov_factor * fov_factor)
+        return ((depth > -radius) &
+                (np.abs(side_x) - depth * fov_factor <= reach) &
+                (np.abs(side_y) - depth * fov_factor <= reach))
+    
+    def project_batch(self, points, player_pos, player_rot_x, player_rot_y, screen_width, screen_height):
+        """Vectorized project_3d_to_2d for an (..., 3) array of world points.
+        
+        Returns (screen, final_z) with screen shaped (..., 2); points with
+        final_z <= 0.001 are behind the camera and their screen coordinates are meaningless.
+        """
+        rotation, translation = self.build_matrix(player_pos, player_rot_x, player_rot_y)
+        camera_points = points @ rotation.T + translation
+        final_z = camera_points[..., 2]
+        
+        # Keep the divide finite for points that will be clipped anyway
+        depth = np.where(final_z > 0.001, final_z, 1.0) * self._fov_factor
+        
+        # Perspective divide, then scale to the viewport (flipping Y)
+        screen = camera_points[..., :2] / depth[..., None]
+        screen *= (screen_width / 2, -screen_height / 2)
+        screen += (screen_width / 2, screen_height / 2)
+        
+        return screen.astype(np.int64), final_z
+
+# Font sizes object emoji are drawn at; scaled labels snap to the nearest so they share fonts and renders
+EMOJI_SIZES = (12, 16, 20, 24, 28, 32, 40, 48, 64)
 
 class Renderer:
     def __init__(self, screen_width=1024, screen_height=768):
@@ -760,6 +1153,14 @@ class Renderer:
         self.font = pygame.font.Font(None, 28)
         self.small_font = pygame.font.Font(None, 20)
         self.large_font = pygame.font.Font(None, 36)
+        # Default-face fonts by size, shared with get_font so the UI fonts are never opened twice
+        self.fonts = {28: self.font, 20: self.small_font, 36: self.large_font}
+        for size in EMOJI_SIZES:
+            self.get_font(size)
+        # Rendered text by (size, text, color, shadow), least recently used first
+        self.text_cache = OrderedDict()
+        # Last (text, surface) of each status line, by slot name
+        self.status_texts = {}
         self.width = screen_width
         self.height = screen_height
         self.camera = Camera()
@@ -796,6 +1197,40 @@ class Renderer:
             'orange': (255, 165, 0),
             'ui_bg': (0, 0, 0, 128)  # Semi-transparent black
         }
+        # UI panel backgrounds by (width, height, color), least recently used first
+        self.ui_background_cache = OrderedDict()
+        # Controls help panel, composed on first use
+        self.controls_panel = None
+        # Main HUD panel and the player values it shows
+        self.hud_key = None
+        self.hud_panel = None
+        
+        # Enhanced crosshair, drawn once around the center of a 40x40 sprite
+        self.crosshair = pygame.Surface((40, 40), pygame.SRCALPHA)
+        white = self.colors['white']
+        pygame.draw.circle(self.crosshair, white, (20, 20), 8, 2)  # Outer crosshair
+        pygame.draw.circle(self.crosshair, white, (20, 20), 2)  # Inner crosshair
+        # Cross lines
+        pygame.draw.line(self.crosshair, white, (5, 20), (15, 20), 2)
+        pygame.draw.line(self.crosshair, white, (25, 20), (35, 20), 2)
+        pygame.draw.line(self.crosshair, white, (20, 5), (20, 15), 2)
+        pygame.draw.line(self.crosshair, white, (20, 25), (20, 35), 2)
+        # Pre-rendered monster/treasure bodies by (type, size), filled on first use
+        self.object_sprites = {}
+        # (generation, surface) for the minimap terrain layer, rebuilt when the world changes
+        self.minimap_terrain = None
+        # Pixel offsets covered by a filled pygame.draw.circle, by radius
+        self.dot_stamps = {}
+        # Distance-shaded wall and floor colors; the floor rows are corridor/door, then room
+        self.wall_shades = shade_lut([(140, 110, 80)], 25, 0.4)
+        self.floor_shades = shade_lut([(120, 160, 120), (140, 170, 200)], 50, 0.7)
+        self.floor_grid_shades = np.minimum(255, (self.floor_shades * 1.5).astype(np.int64))  # Brighter grid lines
+        # get_maze_color's colors, from high walls down to base floor, for the jitted terrain shader
+        self.maze_palette = np.array([self.colors[name] for name in
+                                      ('wall', 'cliff', 'rock', 'ground_mid', 'ground_base')], dtype=np.float64)
+        # Threshold/color tables for the vectorized maze colorer, lowest band first
+        self.maze_thresholds = np.array([0.4, 0.6, 0.8])
+        self.maze_color_lut = self.maze_palette[::-1].astype(np.uint8)
     
     def render_sky_gradient(self):
         """Render a clean sky background"""
@@ -841,20 +1276,128 @@ class Renderer:
         else:  # Base floor
             return self.colors['ground_base']
     
+    def maze_colors(self, heights, wall_height):
+        """Vectorized get_maze_color: (..., 3) uint8 colors for an array of heights"""
+        heights = np.asarray(heights)
+        bands = np.searchsorted(self.maze_thresholds * wall_height, heights, side='right')
+        # Below the lowest wall band only the elevated-floor test remains
+        bands = np.where(bands == 0, heights > 0.5, bands + 1)
+        return self.maze_color_lut[bands]
+    
+    def get_font(self, size):
+        """Default-face font at size, snapped to 4 px steps so scaled labels share a few fonts"""
+        size = max(12, size // 4 * 4)
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+    
+    def emoji_size(self, size):
+        """Nearest size on the emoji LOD ladder"""
+        return min(EMOJI_SIZES, key=lambda step: abs(step - size))
+    
+    def render_text(self, size, text, color, shadow=0):
+        """Antialiased text surface; a nonzero shadow composites a black copy that many pixels down-right behind it"""
+        surface = self.get_font(size).render(text, True, color)
+        if shadow:
+            # Composite "text over black shadow" from the glyph coverage; blitting one surface onto
+            # another would blend the antialiased edges differently from two blits to the screen
+            coverage = pygame.surfarray.array_alpha(surface) / 255.0
+            width, height = coverage.shape
+            text_alpha = np.zeros((width + shadow, height + shadow))
+            text_alpha[:width, :height] = coverage
+            shadow_alpha = np.zeros_like(text_alpha)
+            shadow_alpha[shadow:, shadow:] = coverage
+            alpha = text_alpha + shadow_alpha * (1 - text_alpha)
+            
+            surface = pygame.Surface((width + shadow, height + shadow), pygame.SRCALPHA)
+            pygame.surfarray.pixels3d(surface)[:] = np.multiply.outer(
+                text_alpha / np.maximum(alpha, 1e-9), color[:3]).round().astype(np.uint8)
+            pygame.surfarray.pixels_alpha(surface)[:] = (alpha * 255).round().astype(np.uint8)
+        return surface
+    
+    def get_text(self, size, text, color, shadow=0):
+        """render_text, rendered once and reused while it stays among the last 512 drawn"""
+        key = (size, text, color, shadow)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.text_cache[key] = self.render_text(size, text, color, shadow)
+            if len(self.text_cache) > 512:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+    
+    def get_status_text(self, slot, size, text, color, shadow=0):
+        """render_text for a constantly changing label (position, debug readout), re-rendered only when
+        its text changes; kept out of text_cache so a stream of one-off strings can't evict other text"""
+        cached = self.status_texts.get(slot)
+        if cached is None or cached[0] != text:
+            cached = self.status_texts[slot] = (text, self.render_text(size, text, color, shadow))
+        return cached[1]
+    
+    def blit_batch(self, blits):
+        """Blit a list of (surface, position) pairs with one call"""
+        if FAST_BLITS:
+            self.screen.fblits(blits)
+        else:
+            self.screen.blits(blits, doreturn=False)
+    
     def draw_ui_background(self, rect, color=(0, 0, 0, 200), border_color=(255, 255, 255), border_width=2):
         """Draw a semi-transparent background with border for UI elements"""
-        # Create surface with per-pixel alpha
-        bg_surface = pygame.Surface((rect.width, rect.height))
-        bg_surface.set_alpha(color[3] if len(color) > 3 else 200)
-        bg_surface.fill(color[:3])
+        # Surface-alpha backgrounds are built once per size and color, then reused every frame
+        key = (rect.width, rect.height, tuple(color))
+        bg_surface = self.ui_background_cache.get(key)
+        if bg_surface is None:
+            bg_surface = pygame.Surface((rect.width, rect.height))
+            bg_surface.set_alpha(color[3] if len(color) > 3 else 200)
+            bg_surface.fill(color[:3])
+            self.ui_background_cache[key] = bg_surface
+            if len(self.ui_background_cache) > 16:
+                self.ui_background_cache.popitem(last=False)
+        else:
+            self.ui_background_cache.move_to_end(key)
         self.screen.blit(bg_surface, rect.topleft)
         
         # Draw border
         if border_width > 0:
             pygame.draw.rect(self.screen, border_color, rect, border_width)
     
+    def bbox_on_screen(self, points, valid=None, margin=2):
+        """True for polygons (an (..., K, 2) array of screen points) whose bounding box overlaps the
+        screen; points where valid is False are ignored. The margin keeps outlines that poke in."""
+        points = np.asarray(points)
+        if valid is None:
+            low, high = points.min(axis=-2), points.max(axis=-2)
+        else:
+            low = np.where(valid[..., None], points, np.iinfo(np.int64).max).min(axis=-2)
+            high = np.where(valid[..., None], points, np.iinfo(np.int64).min).max(axis=-2)
+        return ((high[..., 0] >= -margin) & (low[..., 0] < self.width + margin) &
+                (high[..., 1] >= -margin) & (low[..., 1] < self.height + margin))
+    
+    def draw_polygon_batch(self, polygons, colors, outline_colors=None, outline_width=1):
+        """Draw depth-sorted polygons in one pass, each optionally followed by its outline"""
+        draw_polygon = pygame.draw.polygon
+        screen = self.screen
+        if outline_colors is None:
+            for points, color in zip(polygons, colors):
+                draw_polygon(screen, color, points)
+        else:
+            for points, color, outline_color in zip(polygons, colors, outline_colors):
+                draw_polygon(screen, color, points)
+                draw_polygon(screen, outline_color, points, outline_width)
+    
+    def fill_triangles_gfx(self, triangles, colors):
+        """Fill depth-sorted on-screen triangles with SDL_gfx's scanline filler. Only for points
+        within the screen: SDL_gfx takes Sint16 vertices, so far off-screen corners wrap"""
+        fill_polygon = pygame.gfxdraw.filled_polygon
+        screen = self.screen
+        for points, color in zip(triangles, colors):
+            fill_polygon(screen, points, color)
+    
     def render_terrain(self, maze_map, player):
         """Render 3D maze with polygon surfaces and improved graphics"""
+        self.camera.begin_frame(player.rotation_x, player.rotation_y)
         self.render_sky_gradient()
         
         # First, render ground plane
@@ -872,250 +1415,105 @@ class Renderer:
     def render_terrain_surfaces(self, maze_map, player):
         """Render maze as filled polygons/triangles"""
         step = 2  # Balance between quality and performance
-        triangles = []
-        
-        # Generate triangular surfaces
-        for z in range(0, maze_map.height - step, step):
-            for x in range(0, maze_map.width - step, step):
-                # Bounds checking to prevent crashes when far from map
-                if (z + step >= maze_map.height or x + step >= maze_map.width or 
-                    z < 0 or x < 0):
-                    continue
-                    
-                # Get four corner points
-                corners = [
-                    (x, maze_map.terrain[z][x], z),
-                    (x + step, maze_map.terrain[z][x + step], z),
-                    (x, maze_map.terrain[z + step][x], z + step),
-                    (x + step, maze_map.terrain[z + step][x + step], z + step)
-                ]
-                
-                # Create two triangles from quad
-                tri1 = [corners[0], corners[1], corners[2]]
-                tri2 = [corners[1], corners[3], corners[2]]
-                
-                for triangle in [tri1, tri2]:
-                    # Project triangle points to screen
-                    screen_points = []
-                    avg_height = 0
-                    avg_distance = 0
-                    
-                    for px, py, pz in triangle:
-                        world_pos = Vector3D(px, py, pz)
-                        screen_pos = self.camera.project_3d_to_2d(
-                            world_pos, player.position, player.rotation_x, player.rotation_y,
-                            self.width, self.height
-                        )
-                        
-                        if screen_pos and screen_pos[2] > 0.001 and screen_pos[2] < 100 and 0 <= screen_pos[0] < self.width and 0 <= screen_pos[1] < self.height:
-                            screen_points.append((screen_pos[0], screen_pos[1]))
-                            avg_height += py
-                            avg_distance += screen_pos[2]
-                    
-                    # Only render if all points are visible
-                    if len(screen_points) == 3:
-                        avg_height /= 3
-                        avg_distance /= 3
-                        
-                        # Skip triangles that are too far or behind
-                        if avg_distance > 150:  # Further increased render distance
-                            continue
-                            
-                        triangles.append((screen_points, avg_height, avg_distance))
         
-        # Wall faces are now rendered separately in render_maze_walls()
+        # Projection, clipping and shading all run in one jitted pass over the terrain lattice
+        quads = ((maze_map.height - step - 1) // step + 1) * ((maze_map.width - step - 1) // step + 1)
+        screen_points = np.empty((quads * 2, 3, 2), dtype=np.int32)
+        colors = np.empty((quads * 2, 3), dtype=np.uint8)
+        distances = np.empty(quads * 2, dtype=np.float32)
+        _project_and_shade(
+            maze_map.terrain, player.position.x, player.position.y, player.position.z,
+            *self.camera.projection_constants(player.rotation_x, player.rotation_y),
+            step, self.width, self.height, maze_map.wall_height, self.maze_palette,
+            screen_points, colors, distances
+        )
         
-        # Sort triangles by distance (furthest first) with better precision
-        triangles.sort(key=lambda t: t[2], reverse=True)
+        # Wall faces are now rendered separately in render_maze_walls()
         
-        # Render triangles
-        for screen_points, height, distance in triangles:
-            # All points should be on screen
-            if all(0 <= p[0] < self.width and 0 <= p[1] < self.height for p in screen_points):
-                color = self.get_maze_color(height, maze_map.wall_height)
-                
-                # Add lighting effect based on height and distance
-                lighting_factor = max(0.3, min(1.0, 1.0 - distance / 30))
-                shaded_color = tuple(int(c * lighting_factor) for c in color)
-                
-                try:
-                    pygame.draw.polygon(self.screen, shaded_color, screen_points)
-                except:
-                    pass  # Skip invalid polygons
+        # Render only the triangles with all points on screen, furthest first
+        triangles = np.flatnonzero(distances >= 0)
+        triangles = triangles[depth_order(distances[triangles])]
+        self.fill_triangles_gfx(screen_points[triangles].tolist(), colors[triangles].tolist())
     
     def render_terrain_wireframe(self, maze_map, player):
         """Add wireframe detail on top of surfaces"""
         step = 2  # Denser wireframe for smoother appearance
-        
-        # Horizontal lines
-        for z in range(0, maze_map.height, step):
-            line_points = []
-            for x in range(0, maze_map.width, 2):
-                # Bounds checking
-                if z >= maze_map.height or x >= maze_map.width or z < 0 or x < 0:
-                    continue
-                    
-                height = maze_map.terrain[z][x]
-                world_pos = Vector3D(x, height, z)
-                
-                screen_pos = self.camera.project_3d_to_2d(
-                    world_pos, player.position, player.rotation_x, player.rotation_y,
-                    self.width, self.height
-                )
-                
-                if screen_pos and screen_pos[2] > 0 and screen_pos[2] < 100:  # Further increased wireframe distance
-                    line_points.append(screen_pos)
-            
-            # Draw connected wireframe lines
-            for i in range(len(line_points) - 1):
-                if (0 <= line_points[i][0] < self.width and 0 <= line_points[i][1] < self.height and
-                    0 <= line_points[i+1][0] < self.width and 0 <= line_points[i+1][1] < self.height):
-                    
-                    wireframe_color = (60, 80, 60)  # Dark green wireframe
-                    pygame.draw.line(self.screen, wireframe_color, 
-                                   (line_points[i][0], line_points[i][1]),
-                                   (line_points[i+1][0], line_points[i+1][1]), 1)
-        
-        # Vertical lines
-        for x in range(0, maze_map.width, step):
-            line_points = []
-            for z in range(0, maze_map.height, 2):
-                # Bounds checking
-                if z >= maze_map.height or x >= maze_map.width or z < 0 or x < 0:
-                    continue
-                    
-                height = maze_map.terrain[z][x]
-                world_pos = Vector3D(x, height, z)
-                
-                screen_pos = self.camera.project_3d_to_2d(
-                    world_pos, player.position, player.rotation_x, player.rotation_y,
-                    self.width, self.height
-                )
-                
-                if screen_pos and screen_pos[2] > 0 and screen_pos[2] < 100:  # Further increased wireframe distance
-                    line_points.append(screen_pos)
-            
-            # Draw connected wireframe lines
-            for i in range(len(line_points) - 1):
-                if (0 <= line_points[i][0] < self.width and 0 <= line_points[i][1] < self.height and
-                    0 <= line_points[i+1][0] < self.width and 0 <= line_points[i+1][1] < self.height):
-                    
-                    wireframe_color = (60, 80, 60)  # Dark green wireframe
-                    pygame.draw.line(self.screen, wireframe_color, 
-                                   (line_points[i][0], line_points[i][1]),
-                                   (line_points[i+1][0], line_points[i+1][1]), 1)
+        wireframe_color = (60, 80, 60)  # Dark green wireframe
+        
+        # Project the whole wireframe lattice in one pass
+        lattice_z = np.arange(0, maze_map.height, step)
+        lattice_x = np.arange(0, maze_map.width, step)
+        grid_z, grid_x = np.meshgrid(lattice_z, lattice_x, indexing='ij')
+        points = np.stack((grid_x, maze_map.terrain[::step, ::step], grid_z), axis=-1)
+        screen, final_z = self.camera.project_batch(
+            points, player.position, player.rotation_x, player.rotation_y, self.width, self.height
+        )
+        kept = (final_z > 0.001) & (final_z < 100)  # Further increased wireframe distance
+        on_screen = ((screen[..., 0] >= 0) & (screen[..., 0] < self.width) &
+                     (screen[..., 1] >= 0) & (screen[..., 1] < self.height))
+        
+        # Horizontal lines are the lattice rows, vertical lines its columns
+        for axis_screen, axis_kept, axis_on_screen in ((screen, kept, on_screen),
+                                                       (screen.swapaxes(0, 1), kept.T, on_screen.T)):
+            for line_screen, line_kept, line_on_screen in zip(axis_screen, axis_kept, axis_on_screen):
+                self.draw_line_runs(wireframe_color, line_screen[line_kept].tolist(), line_on_screen[line_kept].tolist())
+    
+    def draw_line_runs(self, color, points, on_screen):
+        """Connect consecutive points with one draw.lines call per run of on-screen points"""
+        run = []
+        for point, visible in zip(points, on_screen):
+            if visible:
+                run.append(point)
+                continue
+            if len(run) > 1:
+                pygame.draw.lines(self.screen, color, False, run, 1)
+            run = []
+        if len(run) > 1:
+            pygame.draw.lines(self.screen, color, False, run, 1)
     
     def render_maze_walls(self, maze_map, player):
         """Render vertical wall faces as solid surfaces with proper depth sorting"""
-        wall_quads = []
-        walls_considered = 0
-        walls_culled = 0
-        
-        # Check area around player for walls
-        player_x, player_z = int(player.position.x), int(player.position.z)
         render_range = 25  # Balanced range for moderate sized maze
-        
-        for z in range(max(0, player_z - render_range), min(maze_map.height, player_z + render_range)):
-            for x in range(max(0, player_x - render_range), min(maze_map.width, player_x + render_range)):
-                if maze_map.maze[z][x] == 0:  # This is a wall
-                    # Distance culling for walls - don't render walls too far away
-                    distance_to_wall = ((x - player.position.x)**2 + (z - player.position.z)**2)**0.5
-                    if distance_to_wall > render_range + 5:  # Extended range to prevent pop-in
-                        continue
-                        
-                    # Occlusion culling - skip walls that are behind other walls
-                    if maze_map.is_wall_occluded(x, z, player.position):
-                        continue
-                        
-                    # Check adjacent cells to create wall faces
-                    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # North, East, South, West
-                    
-                    for dx, dz in directions:
-                        adj_x, adj_z = x + dx, z + dz
-                        
-                        # Create wall face if adjacent cell is a corridor
-                        if (0 <= adj_x < maze_map.width and 0 <= adj_z < maze_map.height and 
-                            maze_map.maze[adj_z][adj_x] != 0):  # Adjacent is not a wall
-                            
-                            wall_height = maze_map.wall_height
-                            floor_level = maze_map.base_level
-                            
-                            # Create wall face vertices based on direction
-                            if dx == 0:  # North/South face
-                                if dz == 1:  # North face
-                                    v1 = Vector3D(x, floor_level, z + 1)
-                                    v2 = Vector3D(x + 1, floor_level, z + 1)
-                                    v3 = Vector3D(x + 1, floor_level + wall_height, z + 1)
-                                    v4 = Vector3D(x, floor_level + wall_height, z + 1)
-                                else:  # South face
-                                    v1 = Vector3D(x + 1, floor_level, z)
-                                    v2 = Vector3D(x, floor_level, z)
-                                    v3 = Vector3D(x, floor_level + wall_height, z)
-                                    v4 = Vector3D(x + 1, floor_level + wall_height, z)
-                            else:  # East/West face
-                                if dx == 1:  # East face
-                                    v1 = Vector3D(x + 1, floor_level, z + 1)
-                                    v2 = Vector3D(x + 1, floor_level, z)
-                                    v3 = Vector3D(x + 1, floor_level + wall_height, z)
-                                    v4 = Vector3D(x + 1, floor_level + wall_height, z + 1)
-                                else:  # West face
-                                    v1 = Vector3D(x, floor_level, z)
-                                    v2 = Vector3D(x, floor_level, z + 1)
-                                    v3 = Vector3D(x, floor_level + wall_height, z + 1)
-                                    v4 = Vector3D(x, floor_level + wall_height, z)
-                            
-                            # Project vertices to screen with improved clipping
-                            screen_vertices = []
-                            distances = []
-                            all_vertices_projected = []
-                            
-                            for vertex in [v1, v2, v3, v4]:
-                                screen_pos = self.camera.project_3d_to_2d(
-                                    vertex, player.position, player.rotation_x, player.rotation_y,
-                                    self.width, self.height
-                                )
-                                if screen_pos and screen_pos[2] > 0.001:  # Only check near plane, not screen bounds
-                                    # Clamp coordinates to extended screen bounds to prevent drawing errors
-                                    clamped_x = max(-200, min(self.width + 200, screen_pos[0]))
-                                    clamped_y = max(-200, min(self.height + 200, screen_pos[1]))
-                                    screen_vertices.append((clamped_x, clamped_y))
-                                    distances.append(screen_pos[2])
-                                    all_vertices_projected.append(True)
-                                else:
-                                    all_vertices_projected.append(False)
-                            
-                            # Render wall quad if at least 2 vertices are visible (improved partial rendering)
-                            if len(screen_vertices) >= 2:
-                                avg_distance = sum(distances) / 4
-                                
-                                # Wall color with distance-based lighting
-                                base_color = 140
-                                lighting_factor = max(0.4, min(1.0, 1.0 - avg_distance / 25))
-                                wall_color = (
-                                    int(base_color * lighting_factor),
-                                    int((base_color - 30) * lighting_factor),
-                                    int((base_color - 60) * lighting_factor)
-                                )
-                                
-                                wall_quads.append((screen_vertices, wall_color, avg_distance))
+        quads = maze_map.visible_wall_quads(player.position, render_range)
+        # Only faces whose bounding sphere reaches into the view frustum get projected
+        quads = quads[self.camera.frustum_mask(maze_map.wall_centers[quads], maze_map.wall_radius,
+                                               player.position, player.rotation_x, player.rotation_y)]
+        if len(quads) == 0:
+            return
+        
+        # Project vertices to screen with improved clipping
+        screen, final_z = self.camera.project_batch(
+            maze_map.wall_quad_vertices(quads), player.position, player.rotation_x, player.rotation_y,
+            self.width, self.height
+        )
+        projected = final_z > 0.001  # Only check near plane, not screen bounds
+        # Clamp coordinates to extended screen bounds to prevent drawing errors
+        screen = np.clip(screen, (-200, -200), (self.width + 200, self.height + 200))
+        
+        # Render wall quad if at least 3 vertices are visible (improved partial rendering;
+        # with only two there is no polygon to fill)
+        # Skip quads whose screen bounding box misses the screen entirely
+        drawn = np.flatnonzero((projected.sum(axis=1) >= 3) & self.bbox_on_screen(screen, projected))
+        avg_distances = np.where(projected[drawn], final_z[drawn], 0.0).sum(axis=1) / 4
+        
+        # Wall color with distance-based lighting
+        wall_colors = self.wall_shades[0, shade_bins(self.wall_shades, avg_distances)]
         
         # Sort wall quads by distance (furthest first) for proper depth rendering
-        wall_quads.sort(key=lambda quad: quad[2], reverse=True)
-        
-        # Render sorted wall quads
-        for screen_vertices, wall_color, distance in wall_quads:
-            try:
-                pygame.draw.polygon(self.screen, wall_color, screen_vertices)
-                # Add subtle outline for definition
-                outline_color = (wall_color[0]//2, wall_color[1]//2, wall_color[2]//2)
-                pygame.draw.polygon(self.screen, outline_color, screen_vertices, 1)
-            except:
-                pass  # Skip invalid polygons
+        depth_sorted = depth_order(avg_distances)
+        order = drawn[depth_sorted]
+        wall_colors = wall_colors[depth_sorted]
+        outline_colors = wall_colors // 2  # Subtle outline for definition
+        
+        polygons = [
+            [point for point, ok in zip(points, vertex_projected) if ok]
+            for points, vertex_projected in zip(screen[order].tolist(), projected[order].tolist())
+        ]
+        self.draw_polygon_batch(polygons, wall_colors.tolist(), outline_colors.tolist())
     
     def render_ground_plane(self, maze_map, player):
         """Render detailed floor plane everywhere with enhanced visibility"""
         grid_size = 2  # Larger grid for better visibility
-        ground_quads = []
         
         # Calculate visible range around player - optimized for moderate maze
         render_distance = 35  # Balanced for moderate sized maze
@@ -1124,69 +1522,78 @@ class Renderer:
         start_z = max(0, int(player.position.z - render_distance))
         end_z = min(maze_map.height, int(player.position.z + render_distance))
         
-        # Render floor ONLY in walkable areas (where player can actually stand)
-        for z in range(start_z, end_z - grid_size, grid_size):
-            for x in range(start_x, end_x - grid_size, grid_size):
-                # Check if this area is walkable (corridors=1, rooms=2, doors=3)
-                maze_x = max(0, min(maze_map.width - 1, int(x + grid_size/2)))
-                maze_z = max(0, min(maze_map.height - 1, int(z + grid_size/2)))
-                
-                # Only render floor where player can actually walk
-                if (0 <= maze_x < maze_map.width and 0 <= maze_z < maze_map.height and 
-                    maze_map.maze[maze_z][maze_x] in [1, 2, 3]):  # Only walkable areas
-                    
-                    # Create floor quad BELOW player feet
-                    floor_y = maze_map.base_level - 1.0  # Floor 1 unit below base level
-                    corners = [
-                        Vector3D(x, floor_y, z),
-                        Vector3D(x + grid_size, floor_y, z),
-                        Vector3D(x + grid_size, floor_y, z + grid_size),
-                        Vector3D(x, floor_y, z + grid_size)
-                    ]
-                    
-                    # Project to screen
-                    screen_corners = []
-                    total_distance = 0
-                    
-                    for corner in corners:
-                        screen_pos = self.camera.project_3d_to_2d(
-                            corner, player.position, player.rotation_x, player.rotation_y,
-                            self.width, self.height
-                        )
-                        
-                        if screen_pos and screen_pos[2] > 0.001 and screen_pos[2] < 120:
-                            screen_corners.append((screen_pos[0], screen_pos[1]))
-                            total_distance += screen_pos[2]
-                    
-                    # Only render if all corners are visible
-                    if len(screen_corners) == 4:
-                        avg_distance = total_distance / 4
-                        if avg_distance < 80:  # Increased distance for better floor visibility
-                            # Floor color for walkable areas - very bright and visible
-                            if maze_map.maze[maze_z][maze_x] == 2:  # Room
-                                base_color = (140, 170, 200)  # Bright blue for room floors
-                            else:  # Corridor (1) or door (3)
-                                base_color = (120, 160, 120)  # Bright green for corridor floors
-                            
-                            ground_quads.append((screen_corners, avg_distance, base_color))
-        
-        # Sort by distance (furthest first)
-        ground_quads.sort(key=lambda q: q[1], reverse=True)
-        
-        # Render floor quads
-        for screen_corners, distance, base_color in ground_quads:
-            try:
-                # Distance-based lighting with better visibility
-                fade_factor = max(0.7, 1.0 - distance / 50)  # Much brighter and further visibility
-                color = tuple(int(c * fade_factor) for c in base_color)
-                
-                pygame.draw.polygon(self.screen, color, screen_corners)
-                
-                # Add prominent grid lines for texture
-                grid_color = tuple(min(255, int(c * 1.5)) for c in color)  # Brighter grid lines
-                pygame.draw.polygon(self.screen, grid_color, screen_corners, 2)  # Thicker lines
-            except:
-                pass
+        # Cull whole floor quads against the view frustum before projecting any corner
+        floor_y = maze_map.base_level - 1.0  # Floor 1 unit below base level
+        quad_z = np.arange(start_z, end_z - grid_size, grid_size)
+        quad_x = np.arange(start_x, end_x - grid_size, grid_size)
+        grid_z, grid_x = np.meshgrid(quad_z + grid_size / 2, quad_x + grid_size / 2, indexing='ij')
+        centers = np.stack((grid_x, np.full_like(grid_x, floor_y), grid_z), axis=-1)
+        in_view = self.camera.frustum_mask(
+            centers, grid_size * math.sqrt(0.5), player.position, player.rotation_x, player.rotation_y
+        )
+        
+        # Render floor ONLY in walkable areas (corridors=1, rooms=2, doors=3), sampled at each quad's center cell
+        center_cells = maze_map.maze[start_z + grid_size // 2:end_z - grid_size // 2:grid_size,
+                                     start_x + grid_size // 2:end_x - grid_size // 2:grid_size]
+        rows, cols = np.nonzero(in_view & (center_cells != 0))
+        if len(rows) == 0:
+            return
+        
+        # Create floor quads BELOW player feet and project all their corners at once
+        corner_x = quad_x[cols][:, None] + (0, grid_size, grid_size, 0)
+        corner_z = quad_z[rows][:, None] + (0, 0, grid_size, grid_size)
+        corners = np.stack((corner_x, np.full(corner_x.shape, floor_y), corner_z), axis=-1).astype(np.float64)
+        screen, final_z = self.camera.project_batch(
+            corners, player.position, player.rotation_x, player.rotation_y, self.width, self.height
+        )
+        
+        # Only render if all corners are visible, within the increased floor visibility distance
+        avg_distances = final_z.sum(axis=1) / 4
+        kept = np.flatnonzero(((final_z > 0.001) & (final_z < 120)).all(axis=1) & (avg_distances < 80))
+        if len(kept) == 0:
+            return
+        ground_corners = screen[kept]
+        ground_distances = avg_distances[kept]
+        # Floor color for walkable areas - bright blue for rooms, bright green for corridors (1) and doors (3)
+        ground_colors = (center_cells[rows[kept], cols[kept]] == 2).astype(np.int64)
+        
+        # Skip quads whose screen bounding box misses the screen, then sort by distance (furthest first)
+        on_screen = np.flatnonzero(self.bbox_on_screen(ground_corners))
+        order = on_screen[depth_order(ground_distances[on_screen])]
+        
+        # Distance-based lighting with better visibility, and prominent grid lines for texture
+        kinds = ground_colors[order]
+        bins = shade_bins(self.floor_shades, ground_distances[order])
+        
+        # Render floor quads with thicker outlines
+        self.draw_polygon_batch(ground_corners[order].tolist(), self.floor_shades[kinds, bins].tolist(),
+                                self.floor_grid_shades[kinds, bins].tolist(), 2)
+    
+    def get_object_sprite(self, obj_type, size):
+        """Monster/treasure body (glow, body, highlight, border) drawn once per size; returns (sprite, center)"""
+        key = (obj_type, size)
+        if key not in self.object_sprites:
+            glow_size = size + (3 if obj_type == 'monster' else 2)
+            center = glow_size + 1
+            sprite = pygame.Surface((2 * center + 1, 2 * center + 1), pygame.SRCALPHA)
+            
+            if obj_type == 'monster':
+                pygame.draw.circle(sprite, self.colors['monster_glow'], (center, center), glow_size)  # Outer glow
+                pygame.draw.circle(sprite, self.colors['monster'], (center, center), size)  # Main body
+                # Inner highlight
+                pygame.draw.circle(sprite, (255, 120, 120),
+                                   (center - size // 3, center - size // 3), max(2, size // 2))
+                pygame.draw.circle(sprite, self.colors['black'], (center, center), size, 2)  # Border
+            else:
+                pygame.draw.circle(sprite, self.colors['treasure_glow'], (center, center), glow_size)  # Outer golden glow
+                pygame.draw.circle(sprite, self.colors['treasure'], (center, center), size)  # Main treasure body
+                # Shine effect
+                pygame.draw.circle(sprite, (255, 255, 200),
+                                   (center - size // 4, center - size // 4), max(2, size // 3))
+                pygame.draw.circle(sprite, (200, 150, 0), (center, center), size, 2)  # Border with darker gold
+            
+            self.object_sprites[key] = (sprite, center)
+        return self.object_sprites[key]
     
     def render_objects(self, maze_map, player):
         """Render monsters, treasures with enhanced 3D graphics"""
@@ -1196,15 +1603,15 @@ class Renderer:
         for (x, z), monster in maze_map.monsters.items():
             if not monster['defeated']:
                 # Distance culling - only render monsters within reasonable range
-                distance_to_monster = ((x - player.position.x)**2 + (z - player.position.z)**2)**0.5
-                if distance_to_monster > 50:  # Balanced range for moderate maze
+                dx = x - player.position.x
+                dz = z - player.position.z
+                if dx * dx + dz * dz > 50 * 50:  # Balanced range for moderate maze
                     continue
                     
                 height = maze_map.get_height(x, z) + 2
-                world_pos = Vector3D(x, height, z)
                 
-                screen_pos = self.camera.project_3d_to_2d(
-                    world_pos, player.position, player.rotation_x, player.rotation_y,
+                screen_pos = self.camera.project_3d_to_2d_xyz(
+                    x, height, z, player.position, player.rotation_x, player.rotation_y,
                     self.width, self.height
                 )
                 
@@ -1216,15 +1623,15 @@ class Renderer:
         for (x, z), treasure in maze_map.treasures.items():
             if not treasure['opened']:
                 # Distance culling - only render treasures within reasonable range
-                distance_to_treasure = ((x - player.position.x)**2 + (z - player.position.z)**2)**0.5
-                if distance_to_treasure > 40:  # Balanced range for moderate maze
+                dx = x - player.position.x
+                dz = z - player.position.z
+                if dx * dx + dz * dz > 40 * 40:  # Balanced range for moderate maze
                     continue
                     
                 height = maze_map.get_height(x, z) + 1
-                world_pos = Vector3D(x, height, z)
                 
-                screen_pos = self.camera.project_3d_to_2d(
-                    world_pos, player.position, player.rotation_x, player.rotation_y,
+                screen_pos = self.camera.project_3d_to_2d_xyz(
+                    x, height, z, player.position, player.rotation_x, player.rotation_y,
                     self.width, self.height
                 )
                 
@@ -1241,78 +1648,73 @@ class Renderer:
             size = max(4, int(20 / distance))
             
             if obj_type == 'monster':
-                # Enhanced monster rendering with glow effect
-                glow_size = size + 3
-                
-                # Outer glow
-                pygame.draw.circle(self.screen, self.colors['monster_glow'], 
-                                 (screen_pos[0], screen_pos[1]), glow_size)
-                
-                # Main body with gradient effect
-                pygame.draw.circle(self.screen, self.colors['monster'], 
-                                 (screen_pos[0], screen_pos[1]), size)
-                
-                # Inner highlight
-                highlight_size = max(2, size // 2)
-                pygame.draw.circle(self.screen, (255, 120, 120), 
-                                 (screen_pos[0] - size//3, screen_pos[1] - size//3), highlight_size)
-                
-                # Border
-                pygame.draw.circle(self.screen, self.colors['black'], 
-                                 (screen_pos[0], screen_pos[1]), size, 2)
+                # Enhanced monster rendering with glow effect, pre-rendered per size
+                sprite, center = self.get_object_sprite('monster', size)
+                self.screen.blit(sprite, (screen_pos[0] - center, screen_pos[1] - center))
                 
                 # Monster emoji (if close enough)
                 if distance < 20:
-                    emoji_size = max(16, int(32 / distance))
-                    try:
-                        monster_font = pygame.font.Font(None, emoji_size)
-                        emoji_text = monster_font.render(obj_data['info']['emoji'], True, self.colors['white'])
-                        text_rect = emoji_text.get_rect(center=(screen_pos[0], screen_pos[1] - size - 20))
-                        
-                        # Add text shadow
-                        shadow_text = monster_font.render(obj_data['info']['emoji'], True, self.colors['black'])
-                        shadow_rect = shadow_text.get_rect(center=(screen_pos[0] + 2, screen_pos[1] - size - 18))
-                        self.screen.blit(shadow_text, shadow_rect)
-                        self.screen.blit(emoji_text, text_rect)
-                    except:
-                        pass
+                    emoji_size = self.emoji_size(max(16, int(32 / distance)))
+                    label_y = screen_pos[1] - size - 20
+                    if self.label_on_screen(screen_pos[0], label_y, emoji_size):
+                        # Emoji with its text shadow baked in, centered on the emoji itself
+                        emoji_text = self.get_text(emoji_size, obj_data['info']['emoji'], self.colors['white'], 2)
+                        text_width, text_height = emoji_text.get_width() - 2, emoji_text.get_height() - 2
+                        self.screen.blit(emoji_text, (screen_pos[0] - text_width // 2, label_y - text_height // 2))
             
             elif obj_type == 'treasure':
-                # Enhanced treasure rendering with shine effect
-                glow_size = size + 2
-                
-                # Outer golden glow
-                pygame.draw.circle(self.screen, self.colors['treasure_glow'], 
-                                 (screen_pos[0], screen_pos[1]), glow_size)
-                
-                # Main treasure body
-                pygame.draw.circle(self.screen, self.colors['treasure'], 
-                                 (screen_pos[0], screen_pos[1]), size)
-                
-                # Shine effect
-                shine_size = max(2, size // 3)
-                pygame.draw.circle(self.screen, (255, 255, 200), 
-                                 (screen_pos[0] - size//4, screen_pos[1] - size//4), shine_size)
-                
-                # Border with darker gold
-                pygame.draw.circle(self.screen, (200, 150, 0), 
-                                 (screen_pos[0], screen_pos[1]), size, 2)
+                # Enhanced treasure rendering with shine effect, pre-rendered per size
+                sprite, center = self.get_object_sprite('treasure', size)
+                self.screen.blit(sprite, (screen_pos[0] - center, screen_pos[1] - center))
                 
                 # Treasure symbol with better rendering
                 if distance < 15:
-                    try:
-                        treasure_size = max(12, int(24 / distance))
-                        treasure_font = pygame.font.Font(None, treasure_size)
-                        treasure_text = treasure_font.render("💰", True, self.colors['white'])
-                        text_rect = treasure_text.get_rect(center=(screen_pos[0], screen_pos[1] - size - 15))
-                        
-                        # Add text shadow
-                        shadow_text = treasure_font.render("💰", True, self.colors['black'])
-                        shadow_rect = shadow_text.get_rect(center=(screen_pos[0] + 1, screen_pos[1] - size - 14))
-                        self.screen.blit(shadow_text, shadow_rect)
-                        self.screen.blit(treasure_text, text_rect)
-                    except:
-                        pass
+                    treasure_size = self.emoji_size(max(12, int(24 / distance)))
+                    label_y = screen_pos[1] - size - 15
+                    if self.label_on_screen(screen_pos[0], label_y, treasure_size):
+                        # Symbol with its text shadow baked in, centered on the symbol itself
+                        treasure_text = self.get_text(treasure_size, "💰", self.colors['white'], 1)
+                        text_width, text_height = treasure_text.get_width() - 1, treasure_text.get_height() - 1
+                        self.screen.blit(treasure_text, (screen_pos[0] - text_width // 2, label_y - text_height // 2))
+    
+    def label_on_screen(self, x, y, font_size):
+        """Whether a label centered at (x, y) can touch the screen; a glyph never reaches font_size from its center"""
+        return -font_size <= x < self.width + font_size and -font_size <= y < self.height + font_size
+    
+    def get_minimap_terrain(self, maze_map, minimap_size):
+        """Minimap terrain layer: a 2x2 swatch per sampled cell, transparent in between"""
+        if self.minimap_terrain is None or self.minimap_terrain[0] != maze_map.generation:
+            cell_colors = self.maze_colors(maze_map.terrain[::2, ::2], maze_map.wall_height)
+            map_x = (np.arange(0, maze_map.width, 2) * (minimap_size / maze_map.width)).astype(np.int64)
+            map_z = (np.arange(0, maze_map.height, 2) * (minimap_size / maze_map.height)).astype(np.int64)
+            
+            # surfarray views are indexed [x, y]
+            terrain = pygame.Surface((minimap_size, minimap_size), pygame.SRCALPHA)
+            pixels, alpha = pygame.surfarray.pixels3d(terrain), pygame.surfarray.pixels_alpha(terrain)
+            alpha[:] = 0
+            for dx, dz in ((0, 0), (1, 0), (0, 1), (1, 1)):
+                cells = np.ix_(map_x + dx, map_z + dz)
+                pixels[cells] = cell_colors.transpose(1, 0, 2)
+                alpha[cells] = 255
+            del pixels, alpha  # Release the surface lock
+            self.minimap_terrain = (maze_map.generation, terrain)
+        return self.minimap_terrain[1]
+    
+    def stamp_dots(self, centers, color, radius):
+        """Draw filled circles at an (N, 2) array of screen points with one indexed write"""
+        if len(centers) == 0:
+            return
+        offsets = self.dot_stamps.get(radius)
+        if offsets is None:
+            # Rasterize the circle once so the stamp covers exactly the pixels draw.circle would
+            stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+            pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), radius)
+            offsets = self.dot_stamps[radius] = np.argwhere(pygame.surfarray.array2d(stamp) != 0) - radius
+        
+        pixels = (centers[:, None, :] + offsets).reshape(-1, 2)
+        pixels = pixels[(pixels[:, 0] >= 0) & (pixels[:, 0] < self.width) &
+                        (pixels[:, 1] >= 0) & (pixels[:, 1] < self.height)]
+        pygame.surfarray.pixels3d(self.screen)[pixels[:, 0], pixels[:, 1]] = color
     
     def render_minimap(self, maze_map, player):
         """Render a minimap in the corner"""
@@ -1334,34 +1736,16 @@ class Renderer:
         scale_x = minimap_size / maze_map.width
         scale_z = minimap_size / maze_map.height
         
-        # Draw terrain on minimap
-        for z in range(0, maze_map.height, 2):
-            for x in range(0, maze_map.width, 2):
-                # Bounds checking
-                if z >= maze_map.height or x >= maze_map.width or z < 0 or x < 0:
-                    continue
-                    
-                height = maze_map.terrain[z][x]
-                color = self.get_maze_color(height, maze_map.wall_height)
-                
-                map_x = int(x * scale_x) + minimap_x
-                map_y = int(z * scale_z) + minimap_y
-                
-                pygame.draw.rect(self.screen, color, (map_x, map_y, 2, 2))
-        
-        # Draw monsters on minimap
-        for (x, z), monster in maze_map.monsters.items():
-            if not monster['defeated']:
-                map_x = int(x * scale_x) + minimap_x
-                map_y = int(z * scale_z) + minimap_y
-                pygame.draw.circle(self.screen, self.colors['red'], (map_x, map_y), 2)
+        # Draw terrain on minimap from the cached layer
+        self.screen.blit(self.get_minimap_terrain(maze_map, minimap_size), (minimap_x, minimap_y))
         
-        # Draw treasures on minimap
-        for (x, z), treasure in maze_map.treasures.items():
-            if not treasure['opened']:
-                map_x = int(x * scale_x) + minimap_x
-                map_y = int(z * scale_z) + minimap_y
-                pygame.draw.circle(self.screen, self.colors['yellow'], (map_x, map_y), 1)
+        # Draw monsters, then treasures on minimap, each kind stamped in one batch
+        scale = np.array([scale_x, scale_z])
+        offset = np.array([minimap_x, minimap_y])
+        monster_cells = maze_map.monster_xz[maze_map.monster_alive]
+        treasure_cells = maze_map.treasure_xz[maze_map.treasure_closed]
+        self.stamp_dots((monster_cells * scale).astype(np.int64) + offset, self.colors['red'], 2)
+        self.stamp_dots((treasure_cells * scale).astype(np.int64) + offset, self.colors['yellow'], 1)
         
         # Draw player on minimap
         player_map_x = int(player.position.x * scale_x) + minimap_x
@@ -1369,8 +1753,9 @@ class Renderer:
         pygame.draw.circle(self.screen, self.colors['green'], (player_map_x, player_map_y), 3)
         
         # Player direction indicator
-        dir_x = player_map_x + int(8 * math.sin(math.radians(player.rotation_y)))
-        dir_y = player_map_y + int(8 * math.cos(math.radians(player.rotation_y)))
+        dir_cos, dir_sin = sincos(player.rotation_y)
+        dir_x = player_map_x + int(8 * dir_sin)
+        dir_y = player_map_y + int(8 * dir_cos)
         pygame.draw.line(self.screen, self.colors['green'], 
                         (player_map_x, player_map_y), (dir_x, dir_y), 2)
         
@@ -1378,20 +1763,61 @@ class Renderer:
         pygame.draw.rect(self.screen, self.colors['white'], 
                         (minimap_x-1, minimap_y-1, minimap_size+2, minimap_size+2), 2)
     
-    def render_ui(self, player, maze_map=None):
-        """Render UI elements with better visibility"""
-        # Main UI panel background (left side)
-        main_ui_rect = pygame.Rect(10, 10, 280, 140)
-        self.draw_ui_background(main_ui_rect, (0, 0, 0, 220), (0, 255, 255), 2)
+    def new_panel(self, width, height, color, border_color, labels):
+        """Translucent bordered panel background for premultiplied compositing. The surface
+        grows past width x height to fit any of the (surface, position) labels that overhang it."""
+        panel = pygame.Surface((max([width] + [x + text.get_width() for text, (x, y) in labels]),
+                                max([height] + [y + text.get_height() for text, (x, y) in labels])),
+                               pygame.SRCALPHA)
+        panel.fill(color, (0, 0, width, height))
+        pygame.draw.rect(panel, border_color, (0, 0, width, height), 2)
+        return panel
+    
+    def blit_labels(self, panel, labels):
+        """Composite (surface, position) labels onto a panel from new_panel"""
+        # Premultiplied blending composites text over the translucent fill exactly as it would over the screen
+        for text, position in labels:
+            panel.blit(text.premul_alpha(), position, special_flags=pygame.BLEND_PREMULTIPLIED)
+    
+    def build_controls_panel(self):
+        """Static controls panel (background, border and text) as one premultiplied-alpha surface"""
+        controls = [
+            "Vezérlés:",
+            "WASD - Mozgás",
+            "SPACE - Ugrás",
+            "Egér - Forgás", 
+            "E - Interakció",
+            "+/- Egér érzék.",
+            "R - Új világ",
+            "ESC - Kilépés"
+        ]
+        
+        labels = [(self.get_text(20, control, (255, 255, 0) if i == 0 else (255, 255, 255), 1), (5, 5 + i * 20))
+                  for i, control in enumerate(controls)]  # Yellow header, white text
+        panel = self.new_panel(170, 150, (0, 0, 0, 220), (255, 165, 0), labels)
+        self.blit_labels(panel, labels)
+        return panel
+    
+    def build_hud_panel(self, player):
+        """Main UI panel (left side) with health and experience bars, weapon and score, placed at (10, 10)"""
+        # Health text with shadow for better visibility
+        labels = [(self.get_text(28, f"❤️ HP: {player.hp}/{player.max_hp}", (255, 255, 0), 1), (7, 35))]  # Yellow text
+        # Level and experience text with shadow
+        exp_in_level = player.experience % 100
+        labels.append((self.get_text(20, f"Level {player.level} - EXP: {exp_in_level}/100", (255, 255, 0), 1), (7, 85)))
+        # Weapon info and stats with shadow
+        labels.append((self.get_text(28, f"{player.weapon_emoji} {player.weapon.upper()}", (255, 255, 0), 1), (260, 35)))
+        labels.append((self.get_text(20, f"Pontok: {player.stats.pontok}", (255, 255, 0), 1), (260, 65)))
+        panel = self.new_panel(280, 140, (0, 0, 0, 220), (0, 255, 255), labels)
         
         # Health bar
-        health_bg = pygame.Rect(15, 15, 220, 20)
-        pygame.draw.rect(self.screen, (40, 40, 40), health_bg)
-        pygame.draw.rect(self.screen, (255, 255, 255), health_bg, 2)
+        health_bg = pygame.Rect(5, 5, 220, 20)
+        pygame.draw.rect(panel, (40, 40, 40), health_bg)
+        pygame.draw.rect(panel, (255, 255, 255), health_bg, 2)
         
         # Health fill
         health_ratio = player.hp / player.max_hp
-        health_fill = pygame.Rect(17, 17, int(health_ratio * 216), 16)
+        health_fill = pygame.Rect(7, 7, int(health_ratio * 216), 16)
         
         if health_ratio > 0.6:
             health_color = (0, 255, 0)  # Bright green
@@ -1400,125 +1826,96 @@ class Renderer:
         else:
             health_color = (255, 0, 0)  # Bright red
         
-        pygame.draw.rect(self.screen, health_color, health_fill)
-        
-        # Health text with shadow for better visibility
-        health_text = self.font.render(f"❤️ HP: {player.hp}/{player.max_hp}", True, (255, 255, 0))  # Yellow text
-        shadow_text = self.font.render(f"❤️ HP: {player.hp}/{player.max_hp}", True, (0, 0, 0))
-        self.screen.blit(shadow_text, (18, 46))  # Shadow
-        self.screen.blit(health_text, (17, 45))
+        pygame.draw.rect(panel, health_color, health_fill)
         
         # Experience bar
-        exp_bg = pygame.Rect(15, 75, 220, 15)
-        pygame.draw.rect(self.screen, (40, 40, 40), exp_bg)
-        pygame.draw.rect(self.screen, (255, 255, 255), exp_bg, 2)
+        exp_bg = pygame.Rect(5, 65, 220, 15)
+        pygame.draw.rect(panel, (40, 40, 40), exp_bg)
+        pygame.draw.rect(panel, (255, 255, 255), exp_bg, 2)
         
-        exp_in_level = player.experience % 100
-        exp_fill = pygame.Rect(17, 77, int((exp_in_level / 100) * 216), 11)
+        exp_fill = pygame.Rect(7, 67, int((exp_in_level / 100) * 216), 11)
         # Gradient blue for experience
-        pygame.draw.rect(self.screen, (0, 150, 255), exp_fill)
+        pygame.draw.rect(panel, (0, 150, 255), exp_fill)
         
-        # Level and experience text with shadow
-        level_text = self.small_font.render(f"Level {player.level} - EXP: {exp_in_level}/100", True, (255, 255, 0))
-        shadow_text = self.small_font.render(f"Level {player.level} - EXP: {exp_in_level}/100", True, (0, 0, 0))
-        self.screen.blit(shadow_text, (18, 96))
-        self.screen.blit(level_text, (17, 95))
-        
-        # Weapon info with shadow
-        weapon_text = self.font.render(f"{player.weapon_emoji} {player.weapon.upper()}", True, (255, 255, 0))
-        shadow_text = self.font.render(f"{player.weapon_emoji} {player.weapon.upper()}", True, (0, 0, 0))
-        self.screen.blit(shadow_text, (271, 46))
-        self.screen.blit(weapon_text, (270, 45))
-        
-        # Stats with shadow
-        stats_text = self.small_font.render(f"Pontok: {player.stats['pontok']}", True, (255, 255, 0))
-        shadow_text = self.small_font.render(f"Pontok: {player.stats['pontok']}", True, (0, 0, 0))
-        self.screen.blit(shadow_text, (271, 76))
-        self.screen.blit(stats_text, (270, 75))
-        
-        # Controls panel (right side) with background
-        controls_rect = pygame.Rect(self.width - 185, 10, 170, 150)
-        self.draw_ui_background(controls_rect, (0, 0, 0, 220), (255, 165, 0), 2)
+        self.blit_labels(panel, labels)
+        return panel
+    
+    def render_ui(self, player, maze_map=None):
+        """Render UI elements with better visibility"""
+        # Main UI panel, recomposed only when a value shown on it changes
+        hud_key = (player.hp, player.max_hp, player.experience, player.level,
+                   player.weapon, player.weapon_emoji, player.stats.pontok)
+        if hud_key != self.hud_key:
+            self.hud_key, self.hud_panel = hud_key, self.build_hud_panel(player)
+        self.screen.blit(self.hud_panel, (10, 10), special_flags=pygame.BLEND_PREMULTIPLIED)
         
-        controls = [
-            "Vezérlés:",
-            "WASD - Mozgás",
-            "SPACE - Ugrás",
-            "Egér - Forgás", 
-            "E - Interakció",
-            "+/- Egér érzék.",
-            "R - Új világ",
-            "ESC - Kilépés"
-        ]
+        # Controls panel (right side) with background, composed once
+        if self.controls_panel is None:
+            self.controls_panel = self.build_controls_panel()
+        self.screen.blit(self.controls_panel, (self.width - 185, 10), special_flags=pygame.BLEND_PREMULTIPLIED)
         
-        for i, control in enumerate(controls):
-            color = (255, 255, 0) if i == 0 else (255, 255, 255)  # Yellow header, white text
-            control_text = self.small_font.render(control, True, color)
-            shadow_text = self.small_font.render(control, True, (0, 0, 0))
-            self.screen.blit(shadow_text, (self.width - 179, 16 + i * 20))
-            self.screen.blit(control_text, (self.width - 180, 15 + i * 20))
+        # The changing text labels are queued and blitted together
+        labels = []
         
         # Position and physics info with shadow
         jump_status = "Jumping" if player.is_jumping else "On Ground"
-        pos_text = self.small_font.render(f"Pos: ({player.position.x:.1f}, {player.position.y:.1f}, {player.position.z:.1f}) | {jump_status}", 
-                                        True, (255, 255, 0))
-        shadow_text = self.small_font.render(f"Pos: ({player.position.x:.1f}, {player.position.y:.1f}, {player.position.z:.1f}) | {jump_status}", 
-                                        True, (0, 0, 0))
-        self.screen.blit(shadow_text, (18, 116))
-        self.screen.blit(pos_text, (17, 115))
+        pos_text = self.get_status_text('position', 20, f"Pos: ({player.position.x:.1f}, {player.position.y:.1f}, {player.position.z:.1f}) | {jump_status}", 
+                                        (255, 255, 0), 1)
+        labels.append((pos_text, (17, 115)))
         
         # Maze and camera info for debugging with shadow
         if maze_map:
             floor_height = maze_map.get_height(player.position.x, player.position.z)
-            debug_text = self.small_font.render(f"Padló:{floor_height:.1f} | Kamera Y:{player.rotation_x:.0f}°", 
-                                              True, (255, 255, 0))
-            shadow_text = self.small_font.render(f"Padló:{floor_height:.1f} | Kamera Y:{player.rotation_x:.0f}°", 
-                                              True, (0, 0, 0))
+            debug_text = self.get_status_text('debug', 20, f"Padló:{floor_height:.1f} | Kamera Y:{player.rotation_x:.0f}°", 
+                                              (255, 255, 0), 1)
         else:
-            debug_text = self.small_font.render(f"Kamera: X:{player.rotation_x:.0f}° Y:{player.rotation_y:.0f}°", 
-                                              True, (255, 255, 0))
-            shadow_text = self.small_font.render(f"Kamera: X:{player.rotation_x:.0f}° Y:{player.rotation_y:.0f}°", 
-                                              True, (0, 0, 0))
-        self.screen.blit(shadow_text, (271, 96))
-        self.screen.blit(debug_text, (270, 95))
+            debug_text = self.get_status_text('debug', 20, f"Kamera: X:{player.rotation_x:.0f}° Y:{player.rotation_y:.0f}°", 
+                                              (255, 255, 0), 1)
+        labels.append((debug_text, (270, 95)))
+        
+        self.blit_batch(labels)
         
         # Ground plane reference (draw a grid on the ground)
         grid_color = (100, 120, 100)
-        for i in range(-20, 21, 4):
-            # Draw grid lines extending from player position
-            start_world = Vector3D(player.position.x + i, 0, player.position.z - 20)
-            end_world = Vector3D(player.position.x + i, 0, player.position.z + 20)
-            
-            start_screen = self.camera.project_3d_to_2d(
-                start_world, player.position, player.rotation_x, player.rotation_y,
-                self.width, self.height
-            )
-            end_screen = self.camera.project_3d_to_2d(
-                end_world, player.position, player.rotation_x, player.rotation_y,
-                self.width, self.height
-            )
-            
-            if start_screen and end_screen:
-                pygame.draw.line(self.screen, grid_color, 
-                               (start_screen[0], start_screen[1]), 
-                               (end_screen[0], end_screen[1]), 1)
+        # Grid lines extending from player position; lines whose bounding sphere misses the
+        # view frustum are dropped, then both endpoints of the rest are projected at once
+        line_x = player.position.x + np.arange(-20, 21, 4)
+        midpoints = np.stack((line_x, np.zeros_like(line_x), np.full_like(line_x, player.position.z)), axis=-1)
+        line_x = line_x[self.camera.frustum_mask(
+            midpoints, 20, player.position, player.rotation_x, player.rotation_y
+        )]
+        endpoints = np.zeros((len(line_x), 2, 3))
+        endpoints[:, :, 0] = line_x[:, None]
+        endpoints[:, :, 2] = (player.position.z - 20, player.position.z + 20)
+        screen, final_z = self.camera.project_batch(
+            endpoints, player.position, player.rotation_x, player.rotation_y, self.width, self.height
+        )
+        
+        # The lines are disjoint, so one draw.lines strip would add connecting segments; instead
+        # loop over the visible endpoint pairs with the draw function and target bound locally
+        draw_line, surface = pygame.draw.line, self.screen
+        for start_screen, end_screen in screen[(final_z > 0.001).all(axis=1)].tolist():
+            draw_line(surface, grid_color, start_screen, end_screen, 1)
         
         # Enhanced crosshair
-        center_x, center_y = self.width // 2, self.height // 2
-        
-        # Outer crosshair
-        pygame.draw.circle(self.screen, self.colors['white'], (center_x, center_y), 8, 2)
-        # Inner crosshair
-        pygame.draw.circle(self.screen, self.colors['white'], (center_x, center_y), 2)
-        # Cross lines
-        pygame.draw.line(self.screen, self.colors['white'], 
-                        (center_x - 15, center_y), (center_x - 5, center_y), 2)
-        pygame.draw.line(self.screen, self.colors['white'], 
-                        (center_x + 5, center_y), (center_x + 15, center_y), 2)
-        pygame.draw.line(self.screen, self.colors['white'], 
-                        (center_x, center_y - 15), (center_x, center_y - 5), 2)
-        pygame.draw.line(self.screen, self.colors['white'], 
-                        (center_x, center_y + 5), (center_x, center_y + 15), 2)
+        self.screen.blit(self.crosshair, (self.width // 2 - 20, self.height // 2 - 20))
+
+# Cell offsets within 2.5 units of the player's cell, in the order interact checks them
+INTERACT_OFFSETS = tuple((dx, dz) for dx in range(-2, 3) for dz in range(-2, 3) if dx * dx + dz * dz <= 6.25)
+
+# Console text printed by run(), built once at import
+CONSOLE_RULE = "=" * 50
+CONSOLE_HELP = """🎮 Monster Weapons 3D Explorer elindítva!
+🗺️ Fedezd fel a világot és harcolj a szörnyekkel!
+💎 Gyűjts kincseket és szerezz tapasztalatot!
+
+📋 Vezérlés:
+   WASD - Mozgás (SHIFT - gyorsabb)
+   Egér - Kamera forgás
+   E - Interakció
+   R - Új világ generálás
+   F - Teljes képernyő
+   ESC - Kilépés"""
 
 class Game3D:
     def __init__(self):
@@ -1538,55 +1935,27 @@ class Game3D:
                 # Check if room center is walkable
                 if (0 <= test_x < self.maze_map.width and 
                     0 <= test_z < self.maze_map.height and
-                    self.maze_map.maze[test_z][test_x] in [1, 2, 3]):  # Any walkable area
+                    self.maze_map.maze[test_z, test_x] != 0):  # Any walkable area
                     spawn_x, spawn_z = test_x, test_z
                     spawn_found = True
                     print(f"🏠 Spawned in room center at ({spawn_x}, {spawn_z})")
                     break
         
-        # Method 2: Search systematically for any walkable area
+        # Method 2: Walkable area nearest the maze center, anywhere in the maze
         if not spawn_found:
             print("🔍 Searching for walkable spawn area...")
-            for offset in range(1, 30):  # Wider search
-                for dx in range(-offset, offset + 1, 2):  # Skip every other to speed up
-                    for dz in range(-offset, offset + 1, 2):
-                        test_x = spawn_x + dx
-                        test_z = spawn_z + dz
-                        if (0 <= test_x < self.maze_map.width and 
-                            0 <= test_z < self.maze_map.height and
-                            self.maze_map.maze[test_z][test_x] in [1, 2, 3]):  # Walkable areas
-                            spawn_x, spawn_z = test_x, test_z
-                            spawn_found = True
-                            print(f"🎯 Found walkable area at ({spawn_x}, {spawn_z})")
-                            break
-                    if spawn_found:
-                        break
-                if spawn_found:
-                    break
+            nearest = self.maze_map.nearest_walkable(spawn_x, spawn_z)
+            if nearest:
+                spawn_x, spawn_z = nearest
+                spawn_found = True
+                print(f"🎯 Found walkable area at ({spawn_x}, {spawn_z})")
             
-        # Method 3: Guaranteed fallback - find ANY walkable area in entire maze
-        if not spawn_found:
-            print("🚨 Emergency spawn search across entire maze...")
-            for z in range(1, self.maze_map.height - 1, 3):  # Skip areas for speed
-                for x in range(1, self.maze_map.width - 1, 3):
-                    if self.maze_map.maze[z][x] in [1, 2, 3]:  # Walkable
-                        spawn_x, spawn_z = x, z
-                        spawn_found = True
-                        print(f"🆘 Emergency spawn at ({spawn_x}, {spawn_z})")
-                        break
-                if spawn_found:
-                    break
-            
-        # Method 4: Last resort - force create walkable area
+        # Method 3: Last resort - force create walkable area
         if not spawn_found:
             spawn_x = self.maze_map.width // 2
             spawn_z = self.maze_map.height // 2
-            # Force create 5x5 walkable area around center
-            for dx in range(-2, 3):
-                for dz in range(-2, 3):
-                    if (0 <= spawn_x + dx < self.maze_map.width and 
-                        0 <= spawn_z + dz < self.maze_map.height):
-                        self.maze_map.maze[spawn_z + dz][spawn_x + dx] = 2  # Force room
+            # Force create 5x5 walkable area around center, clipped to the maze
+            self.maze_map.carve_room(spawn_x - 2, spawn_z - 2, spawn_x + 3, spawn_z + 3)  # Force room
             print(f"🔨 FORCED 5x5 spawn area at ({spawn_x}, {spawn_z})")
         
         self.player = Player(spawn_x, spawn_z)
@@ -1599,11 +1968,11 @@ class Game3D:
         self.player.is_jumping = False  # Start on ground
         
         # Validate spawn position
-        cell_type = self.maze_map.maze[int(spawn_z)][int(spawn_x)]
+        cell_type = int(self.maze_map.maze[int(spawn_z), int(spawn_x)])
         cell_names = {0: "Wall", 1: "Corridor", 2: "Room", 3: "Door"}
         cell_name = cell_names.get(cell_type, "Unknown")
         
-        if cell_type in [1, 2, 3]:
+        if 1 <= cell_type <= 3:
             print(f"✅ Player spawned successfully in {cell_name} at ({spawn_x}, {spawn_z})")
         else:
             print(f"❌ WARNING: Player spawned in {cell_name}! This shouldn't happen.")
@@ -1618,7 +1987,7 @@ class Game3D:
         self.running = True
         self.mouse_sensitivity = 0.15  # Reduced for better control
         self.battle_active = False
-        self.messages = []  # For displaying temporary messages
+        self.messages = deque()  # For displaying temporary messages, oldest first
         self.message_timer = 0
         
         pygame.mouse.set_visible(False)
@@ -1634,7 +2003,10 @@ class Game3D:
         
     def add_message(self, text, duration=3000):
         """Add a temporary message to display"""
-        self.messages.append({'text': text, 'time': pygame.time.get_ticks(), 'duration': duration})
+        # Rasterized once here; render_messages only fades it
+        surface = self.renderer.font.render(text, True, self.renderer.colors['white'])
+        now = pygame.time.get_ticks()
+        self.messages.append({'text': text, 'time': now, 'duration': duration, 'expire': now + duration, 'surface': surface})
     
     def handle_input(self):
         """Handle keyboard and mouse input with improved responsiveness"""
@@ -1650,25 +2022,13 @@ class Game3D:
             self.player.jump()
         
         if keys[pygame.K_w]:
-            old_speed = self.player.speed
-            self.player.speed = move_speed
-            self.player.move_forward(self.maze_map)
-            self.player.speed = old_speed
+            self.player.move_forward(self.maze_map, move_speed)
         if keys[pygame.K_s]:
-            old_speed = self.player.speed
-            self.player.speed = move_speed
-            self.player.move_backward(self.maze_map)
-            self.player.speed = old_speed
+            self.player.move_backward(self.maze_map, move_speed)
         if keys[pygame.K_a]:
-            old_speed = self.player.speed
-            self.player.speed = move_speed
-            self.player.strafe_left(self.maze_map)
-            self.player.speed = old_speed
+            self.player.strafe_left(self.maze_map, move_speed)
         if keys[pygame.K_d]:
-            old_speed = self.player.speed
-            self.player.speed = move_speed
-            self.player.strafe_right(self.maze_map)
-            self.player.speed = old_speed
+            self.player.strafe_right(self.maze_map, move_speed)
 
         # Mouse look (natural FPS controls) - FIXED Y-axis inversion
         mouse_dx, mouse_dy = pygame.mouse.get_rel()
@@ -1706,7 +2066,7 @@ class Game3D:
                     
                     # Bounds checking for debug
                     if 0 <= px < self.maze_map.width and 0 <= pz < self.maze_map.height:
-                        maze_cell = self.maze_map.maze[pz][px]
+                        maze_cell = self.maze_map.maze[pz, px]
                         cell_type = ['Wall', 'Corridor', 'Room', 'Door'][maze_cell]
                     else:
                         cell_type = 'Out of bounds'
@@ -1735,39 +2095,16 @@ class Game3D:
                 test_z = room['center_y']
                 if (0 <= test_x < self.maze_map.width and 
                     0 <= test_z < self.maze_map.height and
-                    self.maze_map.maze[test_z][test_x] in [1, 2, 3]):
+                    self.maze_map.maze[test_z, test_x] != 0):
                     spawn_x, spawn_z = test_x, test_z
                     spawn_found = True
                     break
         
-        # Search for walkable areas if no room found
-        if not spawn_found:
-            for offset in range(1, 20):
-                for dx in range(-offset, offset + 1, 2):
-                    for dz in range(-offset, offset + 1, 2):
-                        test_x = spawn_x + dx
-                        test_z = spawn_z + dz
-                        if (0 <= test_x < self.maze_map.width and 
-                            0 <= test_z < self.maze_map.height and
-                            self.maze_map.maze[test_z][test_x] in [1, 2, 3]):
-                            spawn_x, spawn_z = test_x, test_z
-                            spawn_found = True
-                            break
-                    if spawn_found:
-                        break
-                if spawn_found:
-                    break
-        
-        # Emergency fallback
+        # Otherwise the walkable area nearest the maze center
         if not spawn_found:
-            for z in range(1, self.maze_map.height - 1, 2):
-                for x in range(1, self.maze_map.width - 1, 2):
-                    if self.maze_map.maze[z][x] in [1, 2, 3]:
-                        spawn_x, spawn_z = x, z
-                        spawn_found = True
-                        break
-                if spawn_found:
-                    break
+            nearest = self.maze_map.nearest_walkable(spawn_x, spawn_z)
+            if nearest:
+                spawn_x, spawn_z = nearest
         
         # Set maze spawn height using physics system
         floor_height = self.maze_map.get_floor_height(spawn_x, spawn_z)
@@ -1786,29 +2123,22 @@ class Game3D:
         player_x = int(round(self.player.position.x))
         player_z = int(round(self.player.position.z))
         
-        # Check larger area for interactions
-        for dx in range(-2, 3):
-            for dz in range(-2, 3):
-                check_x, check_z = player_x + dx, player_z + dz
-                distance = math.sqrt(dx*dx + dz*dz)
-                
-                # Only interact with close objects
-                if distance > 2.5:
-                    continue
-                
-                # Monster interaction
-                if (check_x, check_z) in self.maze_map.monsters:
-                    monster = self.maze_map.monsters[(check_x, check_z)]
-                    if not monster['defeated']:
-                        self.start_battle(monster, (check_x, check_z))
-                        return
-                
-                # Treasure interaction
-                if (check_x, check_z) in self.maze_map.treasures:
-                    treasure = self.maze_map.treasures[(check_x, check_z)]
-                    if not treasure['opened']:
-                        self.open_treasure(treasure)
-                        return
+        # Check larger area for interactions, only close objects
+        monsters, treasures = self.maze_map.monsters, self.maze_map.treasures
+        for dx, dz in INTERACT_OFFSETS:
+            cell = (player_x + dx, player_z + dz)
+            
+            # Monster interaction
+            monster = monsters.get(cell)
+            if monster is not None and not monster['defeated']:
+                self.start_battle(monster, cell)
+                return
+            
+            # Treasure interaction
+            treasure = treasures.get(cell)
+            if treasure is not None and not treasure['opened']:
+                self.open_treasure(treasure, cell)
+                return
         
         self.add_message("🔍 Nincs itt semmi...", 1500)
     
@@ -1833,7 +2163,7 @@ class Game3D:
                 self.add_message(f"🎉 Győzelem! +{hp_gain} HP, +{exp_gain} EXP!", 3000)
                 
             self.player.hp = min(self.player.max_hp, self.player.hp + hp_gain)
-            monster['defeated'] = True
+            self.maze_map.defeat_monster(position)
             
             # Check for level up
             if self.player.gain_experience(0):  # Just check, exp already added
@@ -1853,9 +2183,9 @@ class Game3D:
         update_stats(self.player.stats, monster['name'], self.player.weapon, won, 
                     hp_gain if won else -damage, win_chance)
     
-    def open_treasure(self, treasure):
+    def open_treasure(self, treasure, position):
         """Enhanced treasure system"""
-        treasure['opened'] = True
+        self.maze_map.open_treasure(position)
         content = treasure['contents']
         
         if content == 'health':
@@ -1873,7 +2203,7 @@ class Game3D:
             
         elif content == 'points':
             points = random.randint(30, 75)
-            self.player.stats['pontok'] += points
+            self.player.stats.pontok += points
             self.add_message(f"💰 +{points} pont!", 2500)
         
         # Always give some experience for finding treasures
@@ -1888,71 +2218,94 @@ class Game3D:
         current_time = pygame.time.get_ticks()
         y_offset = 140
         
-        # Remove expired messages
-        self.messages = [msg for msg in self.messages 
-                        if current_time - msg['time'] < msg['duration']]
+        # Remove expired messages from the front; one expiring behind a longer-lived older message
+        # stays queued until it reaches the front, but at zero alpha it is never drawn
+        while self.messages and self.messages[0]['expire'] <= current_time:
+            self.messages.popleft()
         
-        # Render remaining messages
+        # Render remaining messages in one batched blit
+        blits = []
+        add_blit = blits.append
+        center_x = self.renderer.width // 2
+        screen_height = self.renderer.height
         for msg in self.messages:
             age = current_time - msg['time']
-            alpha = max(0, 255 - int((age / msg['duration']) * 255))
+            alpha = 255 - (age * 255) // msg['duration']  # Integer fade; ticks and durations are whole milliseconds
+            if alpha <= 0:
+                continue
             
-            if alpha > 0:
-                text_surface = self.renderer.font.render(msg['text'], True, self.renderer.colors['white'])
-                text_surface.set_alpha(alpha)
-                
-                # Center the message
-                text_rect = text_surface.get_rect(center=(self.renderer.width // 2, y_offset))
-                self.renderer.screen.blit(text_surface, text_rect)
-                y_offset += 30
+            # Center the message; rows only move down, so once one starts below the screen the rest do too
+            text_surface = msg['surface']
+            text_rect = text_surface.get_rect(center=(center_x, y_offset))
+            if text_rect.top >= screen_height:
+                break
+            
+            text_surface.set_alpha(alpha)
+            add_blit((text_surface, text_rect))
+            y_offset += 30
+        self.renderer.blit_batch(blits)
     
-    def run(self):
-        """Enhanced main game loop"""
-        print("🎮 Monster Weapons 3D Explorer elindítva!")
-        print("🗺️ Fedezd fel a világot és harcolj a szörnyekkel!")
-        print("💎 Gyűjts kincseket és szerezz tapasztalatot!")
-        print()
-        print("📋 Vezérlés:")
-        print("   WASD - Mozgás (SHIFT - gyorsabb)")
-        print("   Egér - Kamera forgás")
-        print("   E - Interakció")
-        print("   R - Új világ generálás")
-        print("   F - Teljes képernyő")
-        print("   ESC - Kilépés")
-        
-        while self.running:
-            # Calculate delta time for physics
-            dt = self.renderer.clock.get_time() / 1000.0  # Convert milliseconds to seconds
+    def _make_frame(self):
+        """Build the per-frame step with every call it makes bound to a closure local"""
+        renderer = self.renderer
+        player = self.player
+        tick = renderer.clock.tick
+        handle_input = self.handle_input
+        apply_physics = player.apply_physics
+        render_terrain = renderer.render_terrain
+        render_objects = renderer.render_objects
+        render_minimap = renderer.render_minimap
+        render_ui = renderer.render_ui
+        render_messages = self.render_messages
+        flip = pygame.display.flip
+        
+        def frame():
+            # Cap at 60 FPS; tick returns the length of the frame that just ended, the physics delta time
+            dt = tick(60) / 1000.0  # Convert milliseconds to seconds
             
-            self.handle_input()
+            handle_input()
+            maze_map = self.maze_map  # Re-read every frame because R replaces the maze
             
             # Apply physics EVERY frame (gravity, collision, etc.)
-            self.player.apply_physics(self.maze_map, dt)
+            apply_physics(maze_map, dt)
             
             # Render everything
-            self.renderer.render_terrain(self.maze_map, self.player)
-            self.renderer.render_objects(self.maze_map, self.player)
-            self.renderer.render_minimap(self.maze_map, self.player)
-            self.renderer.render_ui(self.player, self.maze_map)
-            self.render_messages()
+            render_terrain(maze_map, player)
+            render_objects(maze_map, player)
+            render_minimap(maze_map, player)
+            render_ui(player, maze_map)
+            render_messages()
             
-            pygame.display.flip()
-            self.renderer.clock.tick(60)
+            flip()
+        
+        return frame
+    
+    def run(self):
+        """Enhanced main game loop"""
+        print(CONSOLE_HELP)
+        
+        frame = self._make_frame()
+        self.renderer.clock.tick()  # Time the first frame from here rather than from window creation
+        while self.running:
+            frame()
         
         pygame.quit()
         
-        # Show final stats
-        print("\n" + "="*50)
-        print("🏆 JÁTÉK VÉGE - VÉGSŐ STATISZTIKÁK")
-        print("="*50)
-        print(f"⭐ Elért szint: {self.player.level}")
-        print(f"🎯 Tapasztalat: {self.player.experience}")
-        print(f"💰 Pontok: {self.player.stats['pontok']}")
-        print(f"⚔️ Győzelmek: {self.player.stats['gyozelmek']}")
-        print(f"💀 Vereségek: {self.player.stats['veresegek']}")
-        print(f"🌟 Heroikus győzelmek: {self.player.stats['heroikus_gyozelmek']}")
-        print("="*50)
-        print("🎮 Köszönjük a játékot! 👋")
+        # Show final stats in a single write
+        stats = self.player.stats
+        sys.stdout.write("\n".join([
+            "\n" + CONSOLE_RULE,
+            "🏆 JÁTÉK VÉGE - VÉGSŐ STATISZTIKÁK",
+            CONSOLE_RULE,
+            f"⭐ Elért szint: {self.player.level}",
+            f"🎯 Tapasztalat: {self.player.experience}",
+            f"💰 Pontok: {stats.pontok}",
+            f"⚔️ Győzelmek: {stats.gyozelmek}",
+            f"💀 Vereségek: {stats.veresegek}",
+            f"🌟 Heroikus győzelmek: {stats.heroikus_gyozelmek}",
+            CONSOLE_RULE,
+            "🎮 Köszönjük a játékot! 👋"
+        ]) + "\n")
 
 if __name__ == "__main__":
     try:
@@ -1,22 +1,32 @@
 import random
 import time
 import os
+import sys
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def animated_print(text, delay=0.03):
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
+def animated_print(text, delay=0.03, chunk=4):
+    # Reveal a few characters per flush; the sleep scales with the chunk so the pace is unchanged
+    for start in range(0, len(text), chunk):
+        part = text[start:start + chunk]
+        sys.stdout.write(part)
+        sys.stdout.flush()
+        time.sleep(delay * len(part))
     print()
 
+# 1 for every Fullwidth/Wide code point in the Basic Multilingual Plane; others are looked up per character
+WIDE_BMP = bytes(unicodedata.east_asian_width(chr(code)) in ('F', 'W') for code in range(0x10000))
+
+@lru_cache(maxsize=512)  # Box and menu lines repeat across every redraw
 def get_display_length(text):
-    import unicodedata
-    
     length = 0
     for char in text:
-        if unicodedata.east_asian_width(char) in ('F', 'W'):
+        code = ord(char)
+        if WIDE_BMP[code] if code < 0x10000 else unicodedata.east_asian_width(char) in ('F', 'W'):
             length += 2
         elif char == '️':
             continue
@@ -25,34 +35,54 @@ def get_display_length(text):
     
     return length
 
+# Box rows that depend only on the width, built once per width
+@lru_cache(maxsize=32)
+def _border_row(left, right, width):
+    return left + "═" * (width - 2) + right
+
+@lru_cache(maxsize=32)
+def _blank_row(width):
+    return "║" + " " * (width - 2) + "║"
+
 def create_box(lines, width=None):
     if not lines:
         return
     if width is None:
         width = max(get_display_length(line) for line in lines) + 4
     
-    print("╔" + "═" * (width - 2) + "╗")
+    # The whole box goes out in one write instead of a print per line
+    rows = [_border_row("╔", "╗", width)]
+    ascii_width = max(0, width - 3)  # Format specs reject negative widths
     for line in lines:
         if line == "":
-            print("║" + " " * (width - 2) + "║")
+            rows.append(_blank_row(width))
+        elif line.isascii():
+            # One column per character, so the format spec can pad it
+            rows.append(f"║ {line:<{ascii_width}}║")
         else:
             display_len = get_display_length(line)
             padding = width - display_len - 3
-            print(f"║ {line}{' ' * padding}║")
-    print("╚" + "═" * (width - 2) + "╝")
+            rows.append(f"║ {line}{' ' * padding}║")
+    rows.append(_border_row("╚", "╝", width))
+    sys.stdout.write("\n".join(rows) + "\n")
 
 def create_menu_box(title, options, width=40):
-    print("╔" + "═" * (width - 2) + "╗")
+    rows = [_border_row("╔", "╗", width)]
     title_display_len = get_display_length(title)
     title_padding = (width - 2 - title_display_len) // 2
     title_line = " " * title_padding + title + " " * (width - 2 - title_padding - title_display_len)
-    print(f"║{title_line}║")
-    print("╠" + "═" * (width - 2) + "╣")
+    rows.append(f"║{title_line}║")
+    rows.append(_border_row("╠", "╣", width))
+    ascii_width = max(0, width - 4)
     for option in options:
+        if option.isascii():
+            rows.append(f"║  {option:<{ascii_width}}║")
+            continue
         option_display_len = get_display_length(option)
         option_padding = width - option_display_len - 4
-        print(f"║  {option}{' ' * option_padding}║")
-    print("╚" + "═" * (width - 2) + "╝")
+        rows.append(f"║  {option}{' ' * option_padding}║")
+    rows.append(_border_row("╚", "╝", width))
+    sys.stdout.write("\n".join(rows) + "\n")
 
 def print_header():
     create_box([
@@ -63,14 +93,16 @@ def print_header():
 def print_divider(length=60):
     print("═" * length)
 
+MONSTERS = {
+    "sárkány": {"emoji": "🐲", "desc": "Tüzet okádó sárkány"},
+    "troll": {"emoji": "👹", "desc": "Hatalmas kőtroll"}, 
+    "boszorkány": {"emoji": "🧙‍♀️", "desc": "Gonosz boszorkány"}
+}
+MONSTER_NAMES = tuple(MONSTERS)  # Sampled directly instead of listing the keys per call
+
 def get_random_monster():
-    monsters = {
-        "sárkány": {"emoji": "🐲", "desc": "Tüzet okádó sárkány"},
-        "troll": {"emoji": "👹", "desc": "Hatalmas kőtroll"}, 
-        "boszorkány": {"emoji": "🧙‍♀️", "desc": "Gonosz boszorkány"}
-    }
-    monster_name = random.choice(list(monsters.keys()))
-    return monster_name, monsters[monster_name]
+    monster_name = random.choice(MONSTER_NAMES)
+    return monster_name, MONSTERS[monster_name]
 
 def get_weapon_choice():
     create_menu_box("🗡️  FEGYVER VALASZTAS  🗡️", [
@@ -91,13 +123,15 @@ def get_weapon_choice():
             return weapon_map[choice]
         print("❌ Ervenytelen valasztas! Kerlek valassz 1, 2 vagy 3-at!")
 
+# Monster/weapon pairs where the weapon is effective; a set gives a single hash probe per battle
+GOOD_COMBINATIONS = frozenset({
+    ("troll", "kard"),
+    ("boszorkány", "ij"),
+    ("sárkány", "varazspalca")
+})
+
 def calculate_win_chance(monster, weapon):
-    good_combinations = [
-        ("troll", "kard"),
-        ("boszorkány", "ij"), 
-        ("sárkány", "varazspalca")
-    ]
-    return 85 if (monster, weapon) in good_combinations else 25
+    return 85 if (monster, weapon) in GOOD_COMBINATIONS else 25
 
 def show_battle_result(won, win_chance):
     if won and win_chance == 25:
@@ -128,54 +162,57 @@ def show_game_over(name):
         "A sötétség győzedelmeskedett!"
     ], 44)
 
+# Slotted record: counters are plain attribute loads and stores instead of string-keyed dict lookups
+@dataclass(slots=True)
+class Stats:
+    gyozelmek: int = 0
+    veresegek: int = 0
+    heroikus_gyozelmek: int = 0
+    ossz_hp_nyert: int = 0
+    ossz_hp_veszitett: int = 0
+    legjobb_sorozat: int = 0
+    jelenlegi_sorozat: int = 0
+    szornyek: dict = field(default_factory=lambda: {"sárkány": 0, "troll": 0, "boszorkány": 0})
+    fegyverek: dict = field(default_factory=lambda: {"varazspalca": 0, "ij": 0, "kard": 0})
+    pontok: int = 0
+
 def create_stats():
-    return {
-        "gyozelmek": 0,
-        "veresegek": 0,
-        "heroikus_gyozelmek": 0,
-        "ossz_hp_nyert": 0,
-        "ossz_hp_veszitett": 0,
-        "legjobb_sorozat": 0,
-        "jelenlegi_sorozat": 0,
-        "szornyek": {"sárkány": 0, "troll": 0, "boszorkány": 0},
-        "fegyverek": {"varazspalca": 0, "ij": 0, "kard": 0},
-        "pontok": 0
-    }
+    return Stats()
 
 def update_stats(stats, monster, weapon, won, hp_change, win_chance):
-    stats["szornyek"][monster] += 1
-    stats["fegyverek"][weapon] += 1
+    stats.szornyek[monster] += 1
+    stats.fegyverek[weapon] += 1
     
     if won:
-        stats["gyozelmek"] += 1
-        stats["jelenlegi_sorozat"] += 1
-        stats["legjobb_sorozat"] = max(stats["legjobb_sorozat"], stats["jelenlegi_sorozat"])
+        stats.gyozelmek += 1
+        stats.jelenlegi_sorozat += 1
+        stats.legjobb_sorozat = max(stats.legjobb_sorozat, stats.jelenlegi_sorozat)
         if win_chance == 25:
-            stats["heroikus_gyozelmek"] += 1
-            stats["pontok"] += 50
+            stats.heroikus_gyozelmek += 1
+            stats.pontok += 50
         else:
-            stats["pontok"] += 25
+            stats.pontok += 25
     else:
-        stats["veresegek"] += 1
-        stats["jelenlegi_sorozat"] = 0
-        stats["pontok"] -= 10
+        stats.veresegek += 1
+        stats.jelenlegi_sorozat = 0
+        stats.pontok -= 10
     
     if hp_change > 0:
-        stats["ossz_hp_nyert"] += hp_change
+        stats.ossz_hp_nyert += hp_change
     else:
-        stats["ossz_hp_veszitett"] += abs(hp_change)
+        stats.ossz_hp_veszitett += abs(hp_change)
 
 def show_stats_summary(stats, battle_num, max_battles):
-    win_rate = (stats["gyozelmek"] / battle_num * 100) if battle_num > 0 else 0
+    win_rate = (stats.gyozelmek / battle_num * 100) if battle_num > 0 else 0
     create_box([
         "📊 STATISZTIKÁK 📊",
         "",
         f"⚔️  Harcok: {battle_num}/{max_battles}",
-        f"🏆 Győzelmek: {stats['gyozelmek']} ({win_rate:.1f}%)",
-        f"💀 Vereségek: {stats['veresegek']}",
-        f"🌟 Heroikus győzelmek: {stats['heroikus_gyozelmek']}",
-        f"🔥 Legjobb sorozat: {stats['legjobb_sorozat']}",
-        f"💰 Pontok: {stats['pontok']}"
+        f"🏆 Győzelmek: {stats.gyozelmek} ({win_rate:.1f}%)",
+        f"💀 Vereségek: {stats.veresegek}",
+        f"🌟 Heroikus győzelmek: {stats.heroikus_gyozelmek}",
+        f"🔥 Legjobb sorozat: {stats.legjobb_sorozat}",
+        f"💰 Pontok: {stats.pontok}"
     ], 40)
 
 # This file contains only the functions needed for importing